@@ -0,0 +1,58 @@
+"""
+Celery application for api project.
+
+Workers are started with:
+
+    celery -A api worker -Q default,email_priority -Ofair
+    celery -A api worker -Q email_bulk --pool=threads --concurrency=20
+
+Bulk email gets its own worker so large sends never delay time-critical
+messages such as verification emails. SMTP sends are I/O bound, so the
+thread pool (built into Celery) overlaps them; each bulk chunk task holds
+one SMTP session, so --concurrency caps the open sessions.
+
+For more information on this file, see
+https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
+
+app = Celery('api')
+
+# Read every CELERY_* setting from the Django settings module
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+app.autodiscover_tasks()
+
+
+# Notifications that a user is actively waiting on
+PRIORITY_NOTIFICATION_TYPES = frozenset({
+    'WELCOME_EMAIL',
+    'EMAIL_VERIFICATION',
+    'KYC_COMPLETION',
+})
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Route email tasks to the priority or bulk email queue
+
+    Returns None for every other task so it lands on the default queue.
+    """
+    if name == 'core.utils.notifications.process_notification_queue':
+        notification_type = kwargs.get('notification_type')
+        if notification_type is None and len(args) > 1:
+            notification_type = args[1]
+        if notification_type in PRIORITY_NOTIFICATION_TYPES:
+            return {'queue': 'email_priority'}
+        return {'queue': 'email_bulk'}
+    if name in (
+        'core.utils.notifications.send_email_chunk',
+        'core.utils.notifications.process_notification_batch',
+    ):
+        return {'queue': 'email_bulk'}
+    return None
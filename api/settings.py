@@ -255,6 +255,19 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@linkdia.com')
+SUPPORT_EMAIL = config('SUPPORT_EMAIL', default='support@linkdia.com')
+
+# Frontend base URL used for links in notification emails
+FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3000')
+
+# Celery Configuration
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = ('api.celery.route_task',)
+# Notification tasks are I/O bound (SMTP, DB): acknowledge after the task runs and
+# reserve one message at a time so a slow send never holds queued emails hostage
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 
 # Static files configuration for production
 STATIC_URL = 'static/'
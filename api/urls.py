@@ -19,10 +19,11 @@ from django.urls import path, include
 from django.views.decorators.csrf import csrf_exempt
 from graphene_django.views import GraphQLView
 from graphene_file_upload.django import FileUploadGraphQLView
-from django.http import JsonResponse
+from django.http import HttpResponse
 from django.conf import settings
 from django.conf.urls.static import static
 from core.middleware import get_graphql_context
+from core.views import encode_json, profile_picture_view
 
 class CustomFileUploadGraphQLView(FileUploadGraphQLView):
     """
@@ -35,16 +36,19 @@ class CustomFileUploadGraphQLView(FileUploadGraphQLView):
         """
         return get_graphql_context(request)
 
+# Serialized once at import; the root is hit constantly by health checks
+HOME_CONTENT = encode_json({
+    'message': 'Welcome to LinkDia API',
+    'endpoints': {
+        'graphql': '/graphql/',
+        'admin': '/admin/',
+        'accounts': '/accounts/'
+    }
+})
+
 def home_view(request):
     """Simple home view for the API root"""
-    return JsonResponse({
-        'message': 'Welcome to LinkDia API',
-        'endpoints': {
-            'graphql': '/graphql/',
-            'admin': '/admin/',
-            'accounts': '/accounts/'
-        }
-    })
+    return HttpResponse(HOME_CONTENT, content_type='application/json')
 
 urlpatterns = [
     path('', home_view, name='home'),
@@ -55,6 +59,7 @@ urlpatterns = [
         )
     )),
     path('accounts/', include('allauth.urls')),
+    path('api/files/profile-picture/<str:token>/', profile_picture_view, name='profile_picture'),
 ]
 
 # Serve media files during development
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken
 from django.http import HttpRequest
+from core.utils.decorators import flush_cache_batch
 
 User = get_user_model()
 
@@ -19,6 +20,8 @@ class GraphQLAuthenticationMiddleware:
         # Process the request
         self.process_request(request)
         response = self.get_response(request)
+        # Persist any resolver results cached while handling the request
+        flush_cache_batch(request)
         return response
     
     def process_request(self, request):
@@ -62,5 +65,12 @@ def get_graphql_context(request):
     # Ensure user is set on request
     if not hasattr(request, 'user'):
         request.user = AnonymousUser()
-    
+
+    # Request-scoped store for cache_result, flushed by the middleware
+    request._cache_batch = {}
+    request._cache_pending = {}
+
+    # Permission results memoized by require_permission for this request
+    request.permission_cache = {}
+
     return request
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# (index name, table, column) for every column search_professionals matches with icontains.
+# Django renders icontains as UPPER("column"::text) LIKE UPPER(%s) on PostgreSQL, so the
+# indexes are built on that exact expression for the planner to use them.
+TRIGRAM_INDEXES = [
+    ('auth_user_first_name_trgm', 'auth_user', 'first_name'),
+    ('auth_user_last_name_trgm', 'auth_user', 'last_name'),
+    ('professional_profiles_bio_trgm', 'professional_profiles', 'bio_introduction'),
+    ('professional_profiles_expertise_trgm', 'professional_profiles', 'area_of_expertise'),
+    ('professional_profiles_location_trgm', 'professional_profiles', 'location'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm is PostgreSQL-only; the SQLite fallback keeps sequential scans
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" '
+            f'USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_consultationslot_consultation_fee_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -5,6 +5,7 @@ from django.contrib.auth.base_user import BaseUserManager
 from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
 from django.core.exceptions import ValidationError
 import uuid
+from datetime import timedelta
 
 
 class CustomUserManager(BaseUserManager):
@@ -83,6 +84,11 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     def is_client(self):
         return self.user_type == 'CLIENT'
 
+    @property
+    def has_profile_picture(self):
+        # Uses the size column so the image blob is never loaded for the check
+        return bool(self.profile_picture_size)
+
     def get_profile(self):
         """Get the specific profile based on user type"""
         if self.is_professional:
@@ -98,12 +104,13 @@ class PasswordResetToken(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     is_used = models.BooleanField(default=False)
 
+    EXPIRY = timedelta(hours=24)
+
     class Meta:
         db_table = 'password_reset_tokens'
 
     def is_expired(self):
-        from datetime import timedelta
-        return timezone.now() > self.created_at + timedelta(hours=24)
+        return timezone.now() > self.created_at + self.EXPIRY
 
     def __str__(self):
         return f"Password reset token for {self.user.email}"
@@ -156,6 +163,9 @@ class ProfessionalProfile(models.Model):
         ('OTHER', 'Other'),
     ]
 
+    # Step 1 fields that must be filled in before profile setup counts as complete
+    PROFILE_SETUP_FIELDS = ('area_of_expertise', 'years_of_experience', 'bio_introduction', 'location')
+
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='professional_profile')  
     
     # Step 1: Profile Setup Fields - only essential fields
@@ -188,6 +198,10 @@ class ProfessionalProfile(models.Model):
     def __str__(self):
         return f"{self.user.full_name} - Professional"
 
+    def get_missing_setup_fields(self):
+        """Return the profile setup fields that are still empty"""
+        return [field for field in self.PROFILE_SETUP_FIELDS if not getattr(self, field)]
+
     def update_onboarding_step(self, step):
         """Update onboarding step and mark as completed if final step"""
         self.onboarding_step = step
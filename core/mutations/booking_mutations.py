@@ -9,6 +9,7 @@ from core.models import (
     ConsultationAvailability
 )
 from core.utils.permissions import login_required
+from core.utils.helpers import generate_slot_id
 from core.queries.booking_queries import (
     ConsultationBookingType, ProfessionalReviewType, 
     ConsultationSlotType, ProfessionalReviewSummaryType
@@ -83,7 +84,7 @@ class CreateBookingMutation(graphene.Mutation):
                     )
 
                 # 3. Reconstruct all possible slots for that day
-                import datetime, hashlib
+                import datetime
                 from django.utils import timezone as django_timezone
 
                 slot_start = datetime.datetime.combine(input.booking_date, availability.start_time)
@@ -94,9 +95,7 @@ class CreateBookingMutation(graphene.Mutation):
                 while current_start + datetime.timedelta(minutes=availability.duration_minutes) <= slot_end:
                     current_end = current_start + datetime.timedelta(minutes=availability.duration_minutes)
 
-                    slot_hash = hashlib.md5(
-                        f"{professional.id}_{current_start.isoformat()}_{current_end.isoformat()}".encode()
-                    ).hexdigest()
+                    slot_hash = generate_slot_id(professional.id, current_start, current_end)
 
                     if slot_hash == input.slot_id:
                         matching_slot = (current_start, current_end)
@@ -147,10 +147,10 @@ class UpdateProfessionalProfile(Mutation):
                         )
                 
                 # Check if profile setup is complete
-                required_fields = ['area_of_expertise', 'years_of_experience', 'bio_introduction', 'location']
-                has_profile_picture = bool(user.profile_picture_data)
+                missing_fields = profile.get_missing_setup_fields()
+                has_profile_picture = user.has_profile_picture
                 
-                if all(getattr(profile, field) for field in required_fields) and has_profile_picture:
+                if not missing_fields and has_profile_picture:
                     # Profile setup complete, move to next step only if currently on PROFILE_SETUP
                     if profile.onboarding_step == 'PROFILE_SETUP':
                         profile.update_onboarding_step('DOCUMENT_UPLOAD')
@@ -165,10 +165,7 @@ class UpdateProfessionalProfile(Mutation):
                     if profile.onboarding_step != 'PROFILE_SETUP':
                         profile.update_onboarding_step('PROFILE_SETUP')
                     next_step = 'PROFILE_SETUP'
-                    missing_items = []
-                    for field in required_fields:
-                        if not getattr(profile, field):
-                            missing_items.append(field.replace('_', ' ').title())
+                    missing_items = [field.replace('_', ' ').title() for field in missing_fields]
                     if not has_profile_picture:
                         missing_items.append('Profile Picture')
                     
@@ -1087,13 +1084,10 @@ class CheckOnboardingStatus(Mutation):
             blocking_issues = []
             
             # Step 1: Profile Setup
-            required_fields = ['area_of_expertise', 'years_of_experience', 'bio_introduction', 'location']
-            has_profile_picture = bool(user.profile_picture_data)
-            missing_profile_items = []
-            
-            for field in required_fields:
-                if not getattr(profile, field):
-                    missing_profile_items.append(field.replace('_', ' ').title())
+            has_profile_picture = user.has_profile_picture
+            missing_profile_items = [
+                field.replace('_', ' ').title() for field in profile.get_missing_setup_fields()
+            ]
             
             if not has_profile_picture:
                 missing_profile_items.append('Profile Picture')
@@ -1261,9 +1255,8 @@ class MarkStepCompleted(Mutation):
                 error_message = ""
                 
                 if step_number == 1:  # Profile Setup
-                    required_fields = ['area_of_expertise', 'years_of_experience', 'bio_introduction', 'location']
-                    has_profile_picture = bool(user.profile_picture_data)
-                    missing_items = [field for field in required_fields if not getattr(profile, field)]
+                    has_profile_picture = user.has_profile_picture
+                    missing_items = profile.get_missing_setup_fields()
                     
                     if not missing_items and has_profile_picture:
                         step_requirements_met = True
@@ -1341,9 +1334,7 @@ class MarkStepCompleted(Mutation):
                 
                 # Check all steps again to get accurate completed list
                 # Step 1
-                required_fields = ['area_of_expertise', 'years_of_experience', 'bio_introduction', 'location']
-                has_profile_picture = bool(user.profile_picture_data)
-                if all(getattr(profile, field) for field in required_fields) and has_profile_picture:
+                if user.has_profile_picture and not profile.get_missing_setup_fields():
                     steps_completed.append(1)
                 
                 # Step 2
@@ -39,15 +39,15 @@ class Query(graphene.ObjectType):
 
     def resolve_user(self, info, id):
         try:
-            return CustomUser.objects.get(pk=id)
+            return UserType.get_queryset(CustomUser.objects.all(), info).get(pk=id)
         except CustomUser.DoesNotExist:
             return None
 
     def resolve_users(self, info):
-        return CustomUser.objects.all()
+        return UserType.get_queryset(CustomUser.objects.all(), info)
 
     def resolve_professionals(self, info):
-        return CustomUser.objects.filter(user_type='PROFESSIONAL')
+        return UserType.get_queryset(CustomUser.objects.filter(user_type='PROFESSIONAL'), info)
 
     def resolve_clients(self, info):
-        return CustomUser.objects.filter(user_type='CLIENT')
+        return UserType.get_queryset(CustomUser.objects.filter(user_type='CLIENT'), info)
@@ -461,7 +461,7 @@ class BookingQueries(graphene.ObjectType):
         # Start with verified professionals only
         professionals = ProfessionalProfile.objects.filter(
             verification_status='VERIFIED'
-        ).select_related('user').prefetch_related('review_summary', 'pricing')
+        ).select_related('user').defer('user__profile_picture_data').prefetch_related('review_summary', 'pricing')
         
         # Apply filters
         if area_of_expertise:
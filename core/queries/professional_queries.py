@@ -96,7 +96,7 @@ class ProfessionalQuery(ObjectType):
                                     area_of_expertise=None, location=None, 
                                     first=None, skip=None):
         """Get list of professional profiles with filters"""
-        queryset = ProfessionalProfile.objects.select_related('user').all()
+        queryset = ProfessionalProfile.objects.select_related('user').defer('user__profile_picture_data')
         
         # Apply filters
         if verification_status:
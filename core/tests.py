@@ -1,3 +1,55 @@
-from django.test import TestCase
+import socket
+from unittest import mock
+from django.core import mail
+from django.core.mail.backends import locmem
+from django.test import TestCase, override_settings
+from core.models import CustomUser
+from core.utils.notifications import send_bulk_notifications
 
 # Create your tests here.
+
+
+def _closed_port():
+    """Return a local port with nothing listening on it"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class SendBulkNotificationsTests(TestCase):
+    """Tests for send_bulk_notifications"""
+
+    def test_smtp_server_down_counts_every_recipient_as_failed(self):
+        recipients = [CustomUser(email=f'user{i}@example.com') for i in range(3)]
+
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=_closed_port(),
+            EMAIL_USE_TLS=False,
+            EMAIL_TIMEOUT=5,
+        ):
+            results = send_bulk_notifications(
+                recipients, 'Subject', 'account/password_reset_email.html', {}
+            )
+
+        self.assertEqual(results, {'successful': 0, 'failed': 3, 'skipped': 0})
+
+    def test_single_connection_sends_serially_over_one_session(self):
+        recipients = [CustomUser(email=f'user{i}@example.com') for i in range(4)]
+        opened = []
+
+        class RecordingBackend(locmem.EmailBackend):
+            def open(self):
+                opened.append(self)
+                return True
+
+        with mock.patch('core.utils.notifications.get_connection', RecordingBackend):
+            results = send_bulk_notifications(
+                recipients, 'Subject', 'account/password_reset_email.html', {},
+                max_connections=1
+            )
+
+        self.assertEqual(results, {'successful': 4, 'failed': 0, 'skipped': 0})
+        self.assertEqual(len(opened), 1)
+        self.assertEqual(len(mail.outbox), 4)
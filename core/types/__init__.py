@@ -5,7 +5,6 @@ from .user import (
     PasswordResetTokenType,
     UserInputType,
     ClientProfileInputType,
-    ProfessionalProfileInputType,
 )
 
 from .proffesional_profile import (
@@ -19,6 +18,7 @@ from .proffesional_profile import (
     PaymentMethodType,
     OnboardingProgressType,
     ProfessionalSettingsType,
+    ProfessionalProfileInputType,
     ProfessionalDocumentInputType,
     VideoKYCInputType,
     PortfolioInputType,
@@ -1,5 +1,6 @@
 import graphene
 from graphene_django import DjangoObjectType
+from graphene.types.inputobjecttype import InputObjectTypeContainer
 # from core.models import NotificationTemplate, Notification  # Commented out until implemented
 
 
@@ -181,6 +182,20 @@ class NotificationStatusEnum(graphene.Enum):
 
 
 
+# Input Containers
+class MappingInputContainer(InputObjectTypeContainer):
+    """
+    Lean value object for input types that are only read as mappings
+    
+    graphene's default container copies every declared field onto the
+    instance __dict__ as well as into the dict itself. Input types whose
+    mutations read values with data.get('field') can opt into this
+    container with `class Meta: container = MappingInputContainer` to skip
+    those per-field attribute copies.
+    """
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+
 
 # Common Response Types
 class SuccessResponseType(graphene.ObjectType):
@@ -11,7 +11,7 @@ from core.models import (
     ProfessionalReviewSummary,
 )
 from core.types.file_types import FileInfoType
-from core.types.common import ExpertiseAreaEnum
+from core.types.common import ExpertiseAreaEnum, MappingInputContainer
 
 
 # Professional Profile Type
@@ -294,6 +294,9 @@ class ProfessionalProfileInputType(graphene.InputObjectType):
     bioIntroduction = graphene.String()
     location = graphene.String()
 
+    class Meta:
+        container = MappingInputContainer
+
 
 class ProfessionalDocumentInputType(graphene.InputObjectType):
     """Input type for professional document creation"""
@@ -326,6 +329,9 @@ class ConsultationAvailabilityInputType(graphene.InputObjectType):
     google_calendar_sync = graphene.Boolean()
     outlook_calendar_sync = graphene.Boolean()
 
+    class Meta:
+        container = MappingInputContainer
+
 
 class PaymentMethodInputType(graphene.InputObjectType):
     """Input type for payment method creation"""
@@ -1,6 +1,9 @@
+import binascii
 import graphene
 from graphene_django import DjangoObjectType
 from graphene_file_upload.scalars import Upload
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.utils import timezone
 from core.models import (
     CustomUser, 
     ProfessionalProfile, 
@@ -8,18 +11,20 @@ from core.models import (
     PasswordResetToken
 )
 from core.types.file_types import FileInfoType
+from core.types.common import MappingInputContainer
+from core.utils.file_handlers import FileStorageHandler
 
 
 class UserType(DjangoObjectType):
     """GraphQL type for CustomUser model"""
-    full_name = graphene.String()
-    fullName = graphene.String()  # Add camelCase alias
-    firstName = graphene.String()  # Add camelCase alias for first_name
-    lastName = graphene.String()   # Add camelCase alias for last_name
+    full_name = graphene.String()  # Exposed as fullName by graphene's auto camelCase
     is_professional = graphene.Boolean()
     is_client = graphene.Boolean()
     profile_picture = graphene.Field(FileInfoType)
-    profilePictureData = graphene.String()    # Use only camelCase version
+    profile_picture_url = graphene.String()
+    profilePictureData = graphene.String(
+        deprecation_reason="Use profilePictureUrl to stream the image instead"
+    )    # Use only camelCase version
     
     class Meta:
         model = CustomUser
@@ -31,18 +36,11 @@ class UserType(DjangoObjectType):
             'profile_picture_name', 'profile_picture_content_type', 'profile_picture_size'
         )
 
-    def resolve_full_name(self, info):
-        return self.full_name
-    
-    def resolve_fullName(self, info):
-        return self.full_name
-    
-    def resolve_firstName(self, info):
-        return self.first_name
-    
-    def resolve_lastName(self, info):
-        return self.last_name
-    
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        # The image blob is only needed by the picture resolvers, which load it on demand
+        return queryset.defer('profile_picture_data')
+
     def resolve_is_professional(self, info):
         return self.is_professional
     
@@ -50,13 +48,32 @@ class UserType(DjangoObjectType):
         return self.is_client
     
     def resolve_profile_picture(self, info):
-        return FileInfoType.from_instance(self, 'profile_picture')
+        # Build once per instance; the same user often appears several times in a response
+        if not hasattr(self, '_file_info_cache'):
+            self._file_info_cache = (
+                FileInfoType.from_instance(self, 'profile_picture')
+                if self.has_profile_picture else None
+            )
+        return self._file_info_cache
+    
+    def resolve_profile_picture_url(self, info):
+        # Signed URL to the streaming view - the image bytes are never encoded here
+        if not self.has_profile_picture:
+            return None
+        url = FileStorageHandler.get_profile_picture_url(self)
+        return info.context.build_absolute_uri(url)
     
     def resolve_profilePictureData(self, info):
-        # Return base64 encoded image data if exists
-        if hasattr(self, 'profile_picture_data') and self.profile_picture_data:
-            import base64
-            return base64.b64encode(self.profile_picture_data).decode('utf-8')
+        # Return base64 encoded image data if exists. Check the size column first:
+        # touching the deferred blob issues its own query even when it is empty
+        if not self.has_profile_picture:
+            return None
+        if self.profile_picture_data:
+            # Encode once per instance even if the user is resolved repeatedly
+            if getattr(self, '_b64_cache', None) is None:
+                # b2a_base64 takes the memoryview psycopg2 returns without copying it
+                self._b64_cache = binascii.b2a_base64(self.profile_picture_data, newline=False).decode('ascii')
+            return self._b64_cache
         return None
 
 
@@ -71,6 +88,13 @@ class ClientProfileType(DjangoObjectType):
             'created_at', 'updated_at'
         )
     
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        # Join the user for user_full_name; the image blob is left to UserType's resolvers.
+        # Only applies once a list field resolves client profiles: the current
+        # fields return single instances, which never pass through here
+        return queryset.select_related('user').defer('user__profile_picture_data')
+    
     def resolve_user_full_name(self, info):
         return self.user.full_name
 
@@ -82,9 +106,19 @@ class PasswordResetTokenType(DjangoObjectType):
     class Meta:
         model = PasswordResetToken
         fields = ('id', 'user', 'token', 'created_at', 'is_used')
+
+    @classmethod
+    def get_queryset(cls, queryset, info):
+        # Compare against a single cutoff in SQL rather than per row in Python.
+        # The type is not exposed by any schema field yet, so this is unused for now
+        cutoff = timezone.now() - PasswordResetToken.EXPIRY
+        return queryset.annotate(
+            expired=ExpressionWrapper(Q(created_at__lt=cutoff), output_field=BooleanField())
+        )
     
     def resolve_is_expired(self, info):
-        return self.is_expired()
+        expired = getattr(self, 'expired', None)
+        return self.is_expired() if expired is None else expired
 
 
 # Input Types for mutations
@@ -97,6 +131,9 @@ class UserInputType(graphene.InputObjectType):
     phone_number = graphene.String()
     profile_picture = Upload()
 
+    class Meta:
+        container = MappingInputContainer
+
 
 class ClientProfileInputType(graphene.InputObjectType):
     """Input type for client profile updates"""
@@ -104,10 +141,5 @@ class ClientProfileInputType(graphene.InputObjectType):
     bio = graphene.String()
     location = graphene.String()
 
-
-class ProfessionalProfileInputType(graphene.InputObjectType):
-    """Input type for professional profile updates"""
-    area_of_expertise = graphene.String()
-    years_of_experience = graphene.Int()
-    bio_introduction = graphene.String()
-    location = graphene.String()
\ No newline at end of file
+    class Meta:
+        container = MappingInputContainer
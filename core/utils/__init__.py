@@ -1,21 +1,81 @@
 # Core utilities package
-from .validators import *
-from .helpers import *
-from .decorators import *
-from .permissions import *
-from .notifications import *
-from .integrations import *
+from .validators import (
+    validate_email_format,
+    validate_phone_number,
+    is_valid_phone_number,
+    validate_file_type,
+    validate_file_size,
+    validate_password_strength,
+    validate_professional_license,
+    validate_consultation_time,
+    validate_payment_details,
+    validate_payment_details_bulk,
+)
+from .helpers import (
+    generate_unique_filename,
+    format_currency,
+    calculate_consultation_fee,
+    get_time_slots,
+    parse_availability,
+    generate_meeting_id,
+    sanitize_input,
+    paginate_queryset,
+    search_professionals,
+    filter_by_availability,
+    generate_hash,
+    mask_sensitive_data,
+)
+from .decorators import (
+    require_authentication,
+    require_professional,
+    require_client,
+    require_verification,
+    rate_limit,
+    log_mutation,
+    validate_input,
+    cache_result,
+    handle_exceptions,
+    require_fields,
+    transaction_atomic,
+    mutation,
+)
+from .permissions import (
+    can_view_profile,
+    can_edit_profile,
+    can_view_documents,
+    can_verify_kyc,
+    is_profile_owner,
+    can_manage_availability,
+    can_access_portfolio,
+    require_permission,
+)
+from .notifications import (
+    send_welcome_email,
+    send_verification_email,
+    send_kyc_completion_notice,
+    send_email_notification,
+    create_notification_record,
+    queue_notification,
+    process_notification_queue,
+    queue_notifications,
+    process_notification_batch,
+    send_bulk_notifications,
+    send_email_chunk,
+    queue_bulk_notifications,
+)
 
 __all__ = [
     # From validators
     'validate_email_format',
     'validate_phone_number',
+    'is_valid_phone_number',
     'validate_file_type',
     'validate_file_size',
     'validate_password_strength',
     'validate_professional_license',
     'validate_consultation_time',
     'validate_payment_details',
+    'validate_payment_details_bulk',
     
     # From helpers
     'generate_unique_filename',
@@ -43,26 +103,19 @@ __all__ = [
     'handle_exceptions',
     'require_fields',
     'transaction_atomic',
+    'mutation',
     
     # From permissions
     'can_view_profile',
     'can_edit_profile',
-    'can_book_consultation',
-    'can_cancel_booking',
     'can_view_documents',
     'can_verify_kyc',
     'is_profile_owner',
-    'is_booking_participant',
-    'can_view_booking_details',
-    'can_add_review',
     'can_manage_availability',
     'can_access_portfolio',
     'require_permission',
     
     # From notifications
-    'send_booking_confirmation',
-    'send_booking_reminder',
-    'send_cancellation_notice',
     'send_welcome_email',
     'send_verification_email',
     'send_kyc_completion_notice',
@@ -70,14 +123,9 @@ __all__ = [
     'create_notification_record',
     'queue_notification',
     'process_notification_queue',
+    'queue_notifications',
+    'process_notification_batch',
     'send_bulk_notifications',
-    
-    # From integrations
-    'PaymentGatewayIntegration',
-    'VideoConferencingIntegration',
-    'CalendarIntegration',
-    'NotificationIntegration',
-    'SMSIntegration',
-    'get_available_integrations',
-    'test_integration',
+    'send_email_chunk',
+    'queue_bulk_notifications',
 ]
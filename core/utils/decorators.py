@@ -1,9 +1,11 @@
 import functools
+import hashlib
+import pickle
 import time
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, NamedTuple, Optional
 from django.core.cache import cache
+from django.db import transaction
 from django.http import HttpResponse
-from django.contrib.auth.models import AnonymousUser
 from graphql import GraphQLError
 from core.models import CustomUser, ProfessionalProfile
 import logging
@@ -11,14 +13,44 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class AuthState(NamedTuple):
+    """Authentication flags for the user attached to a GraphQL context"""
+    user: Any
+    is_authenticated: bool
+    is_professional: bool
+    is_client: bool
+
+
+def get_auth_state(info) -> AuthState:
+    """
+    Return the auth flags for the current request, computed once per user
+    
+    The result is cached on the context so stacked decorators and nested
+    resolvers don't repeat the same checks. The cache is keyed on the user
+    object, so it is rebuilt if authentication swaps the user mid-request.
+    """
+    context = info.context
+    user = getattr(context, 'user', None)
+    state = getattr(context, '_auth_cache', None)
+    if state is None or state.user is not user:
+        is_authenticated = user is not None and user.is_authenticated
+        state = AuthState(
+            user=user,
+            is_authenticated=is_authenticated,
+            is_professional=is_authenticated and user.is_professional,
+            is_client=is_authenticated and user.is_client,
+        )
+        context._auth_cache = state
+    return state
+
+
 def require_authentication(func: Callable) -> Callable:
     """
     Decorator to require user authentication for GraphQL resolvers
     """
     @functools.wraps(func)
     def wrapper(self, info, *args, **kwargs):
-        user = info.context.user
-        if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+        if not get_auth_state(info).is_authenticated:
             raise GraphQLError("Authentication required")
         return func(self, info, *args, **kwargs)
     return wrapper
@@ -34,11 +66,11 @@ def require_professional(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     def wrapper(self, info, *args, **kwargs):
-        user = info.context.user
-        if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+        auth = get_auth_state(info)
+        if not auth.is_authenticated:
             raise GraphQLError("Authentication required")
         
-        if not user.is_professional:
+        if not auth.is_professional:
             raise GraphQLError("Professional account required")
         
         return func(self, info, *args, **kwargs)
@@ -51,17 +83,33 @@ def require_client(func: Callable) -> Callable:
     """
     @functools.wraps(func)
     def wrapper(self, info, *args, **kwargs):
-        user = info.context.user
-        if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+        auth = get_auth_state(info)
+        if not auth.is_authenticated:
             raise GraphQLError("Authentication required")
         
-        if not user.is_client:
+        if not auth.is_client:
             raise GraphQLError("Client account required")
         
         return func(self, info, *args, **kwargs)
     return wrapper
 
 
+def get_verification_status(user) -> Optional[str]:
+    """
+    Return the user's professional verification status, or None without a profile
+    
+    Reuses an already loaded professional_profile and otherwise fetches the
+    single column, so a missing profile never goes through DoesNotExist.
+    """
+    descriptor = CustomUser.professional_profile
+    if descriptor.is_cached(user):
+        profile = descriptor.related.get_cached_value(user)
+        return profile.verification_status if profile is not None else None
+    return ProfessionalProfile.objects.filter(user=user).values_list(
+        'verification_status', flat=True
+    ).first()
+
+
 def require_verification(verification_status: str = 'VERIFIED') -> Callable:
     """
     Decorator to require professional verification status
@@ -72,25 +120,58 @@ def require_verification(verification_status: str = 'VERIFIED') -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(self, info, *args, **kwargs):
-            user = info.context.user
-            if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+            auth = get_auth_state(info)
+            if not auth.is_authenticated:
                 raise GraphQLError("Authentication required")
             
-            if not user.is_professional:
+            if not auth.is_professional:
                 raise GraphQLError("Professional account required")
             
-            try:
-                profile = user.professional_profile
-                if profile.verification_status != verification_status:
-                    raise GraphQLError(f"Professional verification status '{verification_status}' required")
-            except ProfessionalProfile.DoesNotExist:
+            status = get_verification_status(auth.user)
+            if status is None:
                 raise GraphQLError("Professional profile not found")
+            if status != verification_status:
+                raise GraphQLError(f"Professional verification status '{verification_status}' required")
             
             return func(self, info, *args, **kwargs)
         return wrapper
     return decorator
 
 
+def _check_rate_limit(
+    info,
+    key_prefix: str,
+    max_requests: int = 100,
+    time_window: int = 3600,
+    per_user: bool = True
+) -> None:
+    """Count a request against its rate limit window, raising once the limit is hit"""
+    if per_user:
+        user = info.context.user
+        if user and user.is_authenticated:
+            cache_key = f"rate_limit:{key_prefix}:user:{user.id}"
+        else:
+            # Use IP address for anonymous users
+            ip_address = info.context.META.get('REMOTE_ADDR', 'unknown')
+            cache_key = f"rate_limit:{key_prefix}:ip:{ip_address}"
+    else:
+        cache_key = f"rate_limit:{key_prefix}:global"
+    
+    # add() only creates the key (and its expiry) at the start of a window;
+    # incr() is atomic on shared backends, so concurrent requests can't
+    # both read the same count and slip past the limit
+    cache.add(cache_key, 0, time_window)
+    try:
+        current_count = cache.incr(cache_key)
+    except ValueError:
+        # Window expired between add() and incr()
+        cache.set(cache_key, 1, time_window)
+        current_count = 1
+    
+    if current_count > max_requests:
+        raise GraphQLError(f"Rate limit exceeded. Try again later.")
+
+
 def rate_limit(
     key_prefix: str,
     max_requests: int = 100,
@@ -109,26 +190,7 @@ def rate_limit(
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(self, info, *args, **kwargs):
-            if per_user:
-                user = info.context.user
-                if user and user.is_authenticated:
-                    cache_key = f"rate_limit:{key_prefix}:user:{user.id}"
-                else:
-                    # Use IP address for anonymous users
-                    ip_address = info.context.META.get('REMOTE_ADDR', 'unknown')
-                    cache_key = f"rate_limit:{key_prefix}:ip:{ip_address}"
-            else:
-                cache_key = f"rate_limit:{key_prefix}:global"
-            
-            # Get current count
-            current_count = cache.get(cache_key, 0)
-            
-            if current_count >= max_requests:
-                raise GraphQLError(f"Rate limit exceeded. Try again later.")
-            
-            # Increment count
-            cache.set(cache_key, current_count + 1, time_window)
-            
+            _check_rate_limit(info, key_prefix, max_requests, time_window, per_user)
             return func(self, info, *args, **kwargs)
         return wrapper
     return decorator
@@ -144,7 +206,12 @@ def log_mutation(operation_name: str = None) -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(self, info, *args, **kwargs):
-            start_time = time.time()
+            # Skip timing and user lookup entirely when nothing would be logged
+            if not logger.isEnabledFor(logging.ERROR):
+                return func(self, info, *args, **kwargs)
+            
+            log_info = logger.isEnabledFor(logging.INFO)
+            start_time = time.perf_counter()
             
             # Get operation info
             operation = operation_name or func.__name__
@@ -152,21 +219,23 @@ def log_mutation(operation_name: str = None) -> Callable:
             user_id = user.id if user and user.is_authenticated else None
             
             # Log mutation start
-            logger.info(f"Mutation started: {operation}, User: {user_id}")
+            if log_info:
+                logger.info("Mutation started: %s, User: %s", operation, user_id)
             
             try:
                 result = func(self, info, *args, **kwargs)
                 
                 # Log successful completion
-                execution_time = time.time() - start_time
-                logger.info(f"Mutation completed: {operation}, User: {user_id}, Time: {execution_time:.2f}s")
+                if log_info:
+                    execution_time = time.perf_counter() - start_time
+                    logger.info("Mutation completed: %s, User: %s, Time: %.2fs", operation, user_id, execution_time)
                 
                 return result
                 
             except Exception as e:
                 # Log error
-                execution_time = time.time() - start_time
-                logger.error(f"Mutation failed: {operation}, User: {user_id}, Time: {execution_time:.2f}s, Error: {str(e)}")
+                execution_time = time.perf_counter() - start_time
+                logger.error("Mutation failed: %s, User: %s, Time: %.2fs, Error: %s", operation, user_id, execution_time, e)
                 raise
         
         return wrapper
@@ -186,12 +255,15 @@ def validate_input(**validators) -> Callable:
             phone=lambda x: validate_phone_number(x)['is_valid']
         )
     """
+    # Bind once at decoration time rather than walking the dict on every call
+    validator_items = tuple(validators.items())
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(self, info, *args, **kwargs):
             errors = []
             
-            for field_name, validator in validators.items():
+            for field_name, validator in validator_items:
                 if field_name in kwargs:
                     value = kwargs[field_name]
                     try:
@@ -209,6 +281,45 @@ def validate_input(**validators) -> Callable:
     return decorator
 
 
+def _hash_cache_args(value: Any) -> str:
+    """
+    Hash resolver arguments into a short, stable cache key fragment
+    
+    Uploaded files are dropped since they should never take part in cache keys.
+    """
+    if isinstance(value, dict):
+        value = sorted((k, v) for k, v in value.items() if not hasattr(v, 'read'))
+    else:
+        value = tuple(v for v in value if not hasattr(v, 'read'))
+    
+    try:
+        key_bytes = pickle.dumps(value, protocol=5)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        key_bytes = repr(value).encode()
+    
+    return hashlib.blake2b(key_bytes, digest_size=16).hexdigest()
+
+
+def flush_cache_batch(context) -> None:
+    """
+    Write the results cache_result computed during a request
+    
+    Fresh entries are grouped by timeout and stored with one set_many
+    call per group instead of one cache.set per resolver.
+    """
+    pending = getattr(context, '_cache_pending', None)
+    if not pending:
+        return
+    
+    by_timeout: Dict[int, Dict[str, Any]] = {}
+    for key, (value, timeout) in pending.items():
+        by_timeout.setdefault(timeout, {})[key] = value
+    pending.clear()
+    
+    for timeout, values in by_timeout.items():
+        cache.set_many(values, timeout)
+
+
 def cache_result(
     cache_key_template: str,
     timeout: int = 300,  # 5 minutes
@@ -219,6 +330,7 @@ def cache_result(
     
     Args:
         cache_key_template: Template for cache key (can use {user_id}, {args}, etc.)
+            {args} and {kwargs} are filled with fixed-length hashes of the arguments
         timeout: Cache timeout in seconds
         vary_on_user: Whether to include user ID in cache key
     """
@@ -228,8 +340,8 @@ def cache_result(
             # Build cache key
             cache_key_vars = {
                 'function_name': func.__name__,
-                'args': str(args),
-                'kwargs': str(sorted(kwargs.items()))
+                'args': _hash_cache_args(args),
+                'kwargs': _hash_cache_args(kwargs)
             }
             
             if vary_on_user:
@@ -238,14 +350,26 @@ def cache_result(
             
             cache_key = cache_key_template.format(**cache_key_vars)
             
+            # Results already seen in this request are served without a cache round-trip
+            batch = getattr(info.context, '_cache_batch', None)
+            if batch is not None and cache_key in batch:
+                return batch[cache_key]
+            
             # Try to get cached result
             cached_result = cache.get(cache_key)
             if cached_result is not None:
+                if batch is not None:
+                    batch[cache_key] = cached_result
                 return cached_result
             
             # Execute function and cache result
             result = func(self, info, *args, **kwargs)
-            cache.set(cache_key, result, timeout)
+            if batch is None:
+                cache.set(cache_key, result, timeout)
+            else:
+                # Written in one set_many by flush_cache_batch once the response is built
+                batch[cache_key] = result
+                info.context._cache_pending[cache_key] = (result, timeout)
             
             return result
         return wrapper
@@ -291,11 +415,7 @@ def require_fields(*required_fields) -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(self, info, *args, **kwargs):
-            missing_fields = []
-            
-            for field in required_fields:
-                if field not in kwargs or kwargs[field] is None:
-                    missing_fields.append(field)
+            missing_fields = [field for field in required_fields if kwargs.get(field) is None]
             
             if missing_fields:
                 raise GraphQLError(f"Required fields missing: {', '.join(missing_fields)}")
@@ -305,14 +425,110 @@ def require_fields(*required_fields) -> Callable:
     return decorator
 
 
-def transaction_atomic(func: Callable) -> Callable:
+def transaction_atomic(func: Callable = None, *, savepoint: bool = True) -> Callable:
     """
     Decorator to wrap GraphQL mutations in database transactions
+    
+    Can be applied bare (@transaction_atomic) or with arguments.
+    
+    Args:
+        savepoint: Whether nested calls create a savepoint. Pass False when the
+            caller is known to be the outermost transaction to skip the extra
+            SAVEPOINT/RELEASE round-trips.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, info, *args, **kwargs):
+            with transaction.atomic(savepoint=savepoint):
+                return func(self, info, *args, **kwargs)
+        return wrapper
+    
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def mutation(
+    auth: bool = True,
+    professional: bool = False,
+    client: bool = False,
+    rate_limit_cfg: Optional[Dict[str, Any]] = None,
+    atomic: bool = True,
+    log: bool = True,
+    handle_exc: bool = True,
+    operation_name: str = None,
+    default_message: str = "An error occurred"
+) -> Callable:
     """
-    from django.db import transaction
+    Single decorator combining the common mutation decorators
     
-    @functools.wraps(func)
-    def wrapper(self, info, *args, **kwargs):
-        with transaction.atomic():
-            return func(self, info, *args, **kwargs)
-    return wrapper
+    Equivalent to stacking transaction_atomic, handle_exceptions,
+    require_authentication/require_professional/require_client, rate_limit
+    and log_mutation, but runs every check inside one wrapper frame.
+    
+    Args:
+        auth: Whether to require an authenticated user
+        professional: Whether to require a professional user (implies auth)
+        client: Whether to require a client user (implies auth)
+        rate_limit_cfg: Keyword arguments for rate limiting (see rate_limit), or None
+        atomic: Whether to run the mutation in a database transaction
+        log: Whether to log mutation start, completion and failure
+        handle_exc: Whether to convert unexpected errors into a GraphQLError
+        operation_name: Name of the operation for logging (optional)
+        default_message: Error message shown for unexpected errors
+    
+    Example:
+        @mutation(professional=True, rate_limit_cfg={'key_prefix': 'upload', 'max_requests': 20})
+        def mutate(self, info, **kwargs):
+            ...
+    """
+    needs_auth = auth or professional or client
+    
+    def decorator(func: Callable) -> Callable:
+        operation = operation_name or func.__name__
+        
+        @functools.wraps(func)
+        def wrapper(self, info, *args, **kwargs):
+            if needs_auth:
+                state = get_auth_state(info)
+                if not state.is_authenticated:
+                    raise GraphQLError("Authentication required")
+                if professional and not state.is_professional:
+                    raise GraphQLError("Professional account required")
+                if client and not state.is_client:
+                    raise GraphQLError("Client account required")
+            
+            if rate_limit_cfg is not None:
+                _check_rate_limit(info, **rate_limit_cfg)
+            
+            log_enabled = log and logger.isEnabledFor(logging.ERROR)
+            log_info = log_enabled and logger.isEnabledFor(logging.INFO)
+            if log_enabled:
+                start_time = time.perf_counter()
+                user = info.context.user
+                user_id = user.id if user and user.is_authenticated else None
+                if log_info:
+                    logger.info("Mutation started: %s, User: %s", operation, user_id)
+            
+            try:
+                if atomic:
+                    with transaction.atomic():
+                        result = func(self, info, *args, **kwargs)
+                else:
+                    result = func(self, info, *args, **kwargs)
+            except Exception as e:
+                if log_enabled:
+                    execution_time = time.perf_counter() - start_time
+                    logger.error("Mutation failed: %s, User: %s, Time: %.2fs, Error: %s", operation, user_id, execution_time, e)
+                if not handle_exc or isinstance(e, GraphQLError):
+                    raise
+                logger.error(f"Error in {func.__name__}: {str(e)}", exc_info=True)
+                raise GraphQLError(default_message)
+            
+            if log_info:
+                execution_time = time.perf_counter() - start_time
+                logger.info("Mutation completed: %s, User: %s, Time: %.2fs", operation, user_id, execution_time)
+            
+            return result
+        return wrapper
+    return decorator
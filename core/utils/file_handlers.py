@@ -1,14 +1,110 @@
 """
 File handling utilities for binary file storage in database
 """
-import base64
+import binascii
+import hashlib
+import io
 import mimetypes
+import threading
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Tuple
+from django.core import signing
 from django.core.exceptions import ValidationError
 from django.http import HttpResponse
+from django.urls import reverse
 import magic
 
 
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def _read_with_cap(file, max_size: int) -> bytes:
+    """
+    Read an uploaded file, rejecting it as soon as it exceeds max_size
+    
+    Args:
+        file: The uploaded file object
+        max_size: Maximum allowed size in bytes
+        
+    Returns:
+        The file contents
+        
+    Raises:
+        ValidationError: If the file is larger than max_size
+    """
+    # Django's UploadedFile knows its size up front, so oversized files are never read
+    declared_size = getattr(file, 'size', None)
+    if isinstance(declared_size, int) and declared_size > max_size:
+        raise ValidationError(f"File size {declared_size} bytes exceeds maximum allowed size {max_size} bytes")
+    
+    chunks = []
+    file_size = 0
+    if isinstance(declared_size, int):
+        # One exact-size read; the extra byte shows whether the file is longer than it claimed
+        file_data = file.read(declared_size + 1)
+        if len(file_data) <= declared_size:
+            return file_data
+        chunks.append(file_data)
+        file_size = len(file_data)
+        if file_size > max_size:
+            raise ValidationError(f"File size exceeds maximum allowed size {max_size} bytes")
+    
+    while True:
+        chunk = file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        file_size += len(chunk)
+        if file_size > max_size:
+            raise ValidationError(f"File size exceeds maximum allowed size {max_size} bytes")
+        chunks.append(chunk)
+    
+    return b''.join(chunks)
+
+
+# libmagic rules only look at the start of a file, so sniffing more is wasted work
+MAGIC_SNIFF_BYTES = 2048
+MIME_CACHE_SIZE = 1024
+
+_mime_cache: 'OrderedDict[bytes, str]' = OrderedDict()
+_mime_cache_lock = threading.Lock()
+
+# magic.from_buffer funnels every thread through one shared, locked handle
+_magic_local = threading.local()
+
+
+def _get_magic() -> magic.Magic:
+    """Return this thread's libmagic handle, loading the database once per thread"""
+    handle = getattr(_magic_local, 'handle', None)
+    if handle is None:
+        handle = _magic_local.handle = magic.Magic(mime=True)
+    return handle
+
+
+def sniff_content_type(file_data: bytes) -> str:
+    """
+    Detect a MIME type with libmagic, memoized on the file's leading bytes
+    
+    Uploads from the same camera or document template share their headers,
+    so repeats are answered from an LRU keyed on a hash of the sniffed prefix.
+    """
+    prefix = file_data[:MAGIC_SNIFF_BYTES]
+    key = hashlib.blake2b(prefix, digest_size=16).digest()
+    
+    with _mime_cache_lock:
+        content_type = _mime_cache.get(key)
+        if content_type is not None:
+            _mime_cache.move_to_end(key)
+            return content_type
+    
+    content_type = _get_magic().from_buffer(prefix)
+    
+    with _mime_cache_lock:
+        _mime_cache[key] = content_type
+        if len(_mime_cache) > MIME_CACHE_SIZE:
+            _mime_cache.popitem(last=False)
+    return content_type
+
+
 class FileValidator:
     """Validate file types and sizes"""
     
@@ -26,6 +122,27 @@ class FileValidator:
         'profile_picture': 2 * 1024 * 1024,  # 2MB
     }
     
+    # Known extensions resolve their MIME type without sniffing the file contents
+    EXTENSION_MIME_TYPES = {
+        'jpg': 'image/jpeg',
+        'jpeg': 'image/jpeg',
+        'png': 'image/png',
+        'gif': 'image/gif',
+        'bmp': 'image/bmp',
+        'webp': 'image/webp',
+        'pdf': 'application/pdf',
+        'txt': 'text/plain',
+        'doc': 'application/msword',
+        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        'rtf': 'application/rtf',
+        'mp4': 'video/mp4',
+        'mov': 'video/quicktime',
+        'avi': 'video/x-msvideo',
+        'mkv': 'video/x-matroska',
+        'webm': 'video/webm',
+        '3gp': 'video/3gpp',
+    }
+    
     @classmethod
     def validate_file(cls, file, file_type: str = 'all', max_size_key: str = 'document') -> Dict[str, Any]:
         """
@@ -45,38 +162,26 @@ class FileValidator:
         if not file:
             raise ValidationError("No file provided")
         
-        # Read file data
-        file_data = file.read()
-        file_size = len(file_data)
         file_name = getattr(file, 'name', 'unknown')
         
-        # Reset file pointer
-        if hasattr(file, 'seek'):
-            file.seek(0)
-        
-        # Get content type
-        content_type = getattr(file, 'content_type', None)
-        if not content_type:
-            content_type, _ = mimetypes.guess_type(file_name)
-        
-        # Use python-magic for more accurate content type detection
-        if not content_type:
-            try:
-                content_type = magic.from_buffer(file_data, mime=True)
-            except:
-                content_type = 'application/octet-stream'
-        
-        # Validate file extension
+        # Validate file extension before touching the file contents
         file_extension = file_name.split('.')[-1].lower() if '.' in file_name else ''
         allowed_extensions = cls.ALLOWED_EXTENSIONS.get(file_type, cls.ALLOWED_EXTENSIONS['all'])
         
         if file_extension not in allowed_extensions:
             raise ValidationError(f"File type '{file_extension}' not allowed. Allowed types: {', '.join(allowed_extensions)}")
         
-        # Validate file size
+        # Read file data, validating the size as it streams in
         max_size = cls.MAX_FILE_SIZES.get(max_size_key, cls.MAX_FILE_SIZES['document'])
-        if file_size > max_size:
-            raise ValidationError(f"File size {file_size} bytes exceeds maximum allowed size {max_size} bytes")
+        file_data = _read_with_cap(file, max_size)
+        file_size = len(file_data)
+        
+        # Reset file pointer
+        if hasattr(file, 'seek'):
+            file.seek(0)
+        
+        # Get content type
+        content_type = getattr(file, 'content_type', None) or cls.guess_content_type(file_name, file_extension, file_data)
         
         # Additional validation for images
         if file_type == 'image':
@@ -90,18 +195,40 @@ class FileValidator:
             'extension': file_extension
         }
     
+    @classmethod
+    def guess_content_type(cls, file_name: str, file_extension: str, file_data: bytes) -> str:
+        """
+        Resolve a MIME type, sniffing the contents only as a last resort
+        
+        Args:
+            file_name: Original file name
+            file_extension: Lowercased extension without the dot
+            file_data: Binary file data
+            
+        Returns:
+            MIME content type
+        """
+        content_type = cls.EXTENSION_MIME_TYPES.get(file_extension)
+        if content_type:
+            return content_type
+        
+        content_type, _ = mimetypes.guess_type(file_name)
+        if content_type:
+            return content_type
+        
+        # Use python-magic only when the name gives nothing away
+        try:
+            return sniff_content_type(file_data)
+        except:
+            return 'application/octet-stream'
+    
     @classmethod
     def _validate_image(cls, file_data: bytes, content_type: str) -> None:
         """Additional validation for image files"""
         try:
             from PIL import Image
-            import io
-            
-            # Try to open the image to verify it's a valid image
-            image = Image.open(io.BytesIO(file_data))
-            image.verify()
             
-            # Check image dimensions (optional)
+            # Open once: the size comes from the header without decoding pixels
             image = Image.open(io.BytesIO(file_data))
             width, height = image.size
             
@@ -109,10 +236,15 @@ class FileValidator:
             max_dimension = 4000
             if width > max_dimension or height > max_dimension:
                 raise ValidationError(f"Image dimensions {width}x{height} exceed maximum allowed {max_dimension}x{max_dimension}")
+            
+            # verify() leaves the image unusable, so it runs last on the same object
+            image.verify()
                 
         except ImportError:
             # PIL not available, skip image validation
             pass
+        except ValidationError:
+            raise
         except Exception as e:
             raise ValidationError(f"Invalid image file: {str(e)}")
 
@@ -120,6 +252,9 @@ class FileValidator:
 class FileStorageHandler:
     """Handle file storage operations for binary fields"""
     
+    PROFILE_PICTURE_URL_SALT = 'core.profile_picture_url'
+    PROFILE_PICTURE_URL_MAX_AGE = 60 * 60  # 1 hour
+    
     @staticmethod
     def store_file(file, file_type: str = 'all', max_size_key: str = 'document') -> Dict[str, Any]:
         """
@@ -175,9 +310,43 @@ class FileStorageHandler:
         if not file_data:
             return ""
         
-        base64_data = base64.b64encode(file_data).decode('utf-8')
+        base64_data = binascii.b2a_base64(file_data, newline=False).decode('ascii')
         return f"data:{content_type};base64,{base64_data}"
     
+    @classmethod
+    def get_profile_picture_url(cls, user) -> str:
+        """
+        Build a signed, expiring URL that streams the user's profile picture
+        
+        Args:
+            user: User instance owning the picture
+            
+        Returns:
+            Relative URL to the profile picture view
+        """
+        token = signing.dumps(str(user.pk), salt=cls.PROFILE_PICTURE_URL_SALT)
+        return reverse('profile_picture', kwargs={'token': token})
+    
+    @classmethod
+    def load_profile_picture_token(cls, token: str) -> Optional[str]:
+        """
+        Resolve a signed profile picture token back to a user ID
+        
+        Args:
+            token: Token produced by get_profile_picture_url
+            
+        Returns:
+            User ID, or None if the token is invalid or expired
+        """
+        try:
+            return signing.loads(
+                token,
+                salt=cls.PROFILE_PICTURE_URL_SALT,
+                max_age=cls.PROFILE_PICTURE_URL_MAX_AGE
+            )
+        except signing.BadSignature:
+            return None
+    
     @staticmethod
     def get_file_info(instance, field_prefix: str) -> Optional[Dict[str, Any]]:
         """
@@ -211,65 +380,25 @@ class FileStorageHandler:
         }
 
 
-def process_uploaded_file(uploaded_file, file_type='all', max_size_key='document'):
-    """
-    Process uploaded file and return file data
-    
-    Args:
-        uploaded_file: The uploaded file object
-        file_type: Type of file validation
-        max_size_key: Maximum size validation key
-        
-    Returns:
-        Dict with file data: {'data': bytes, 'name': str, 'content_type': str, 'size': int}
-    """
-    if not uploaded_file:
-        raise ValidationError("No file provided")
-    
-    # Read file data
-    file_data = uploaded_file.read()
-    file_size = len(file_data)
-    file_name = getattr(uploaded_file, 'name', 'unknown')
-    
-    # Get content type
-    content_type, _ = mimetypes.guess_type(file_name)
-    if not content_type:
-        try:
-            content_type = magic.from_buffer(file_data, mime=True)
-        except:
-            content_type = 'application/octet-stream'
-    
-    # Basic validation
-    max_size = FileValidator.MAX_FILE_SIZES.get(max_size_key, 10 * 1024 * 1024)  # 10MB default
-    if file_size > max_size:
-        raise ValidationError(f"File size {file_size} exceeds maximum allowed size {max_size}")
-    
-    return {
-        'data': file_data,
-        'name': file_name,
-        'content_type': content_type,
-        'size': file_size
-    }
-
-
-def process_uploaded_file(uploaded_file, file_type='all', max_size_key='document'):
-    """
-    Process uploaded file and return file data for storage
-    
-    Args:
-        uploaded_file: The uploaded file object
-        file_type: Type of file ('image', 'document', 'all')
-        max_size_key: Key for max file size lookup
-    
-    Returns:
-        Dict with file data for database storage
-    """
-    return FileStorageHandler.store_file(uploaded_file, file_type, max_size_key)
-
-
 class FileUploadMixin:
     """Mixin for GraphQL mutations to handle file uploads"""
     
+    # field_prefix -> (data, name, content_type, size) attribute names
+    _file_field_names: Dict[str, Tuple[str, str, str, str]] = {}
+    
+    @classmethod
+    def get_file_field_names(cls, field_prefix: str) -> Tuple[str, str, str, str]:
+        """Return the four model attribute names backing a stored file"""
+        names = cls._file_field_names.get(field_prefix)
+        if names is None:
+            names = cls._file_field_names[field_prefix] = (
+                f"{field_prefix}_data",
+                f"{field_prefix}_name",
+                f"{field_prefix}_content_type",
+                f"{field_prefix}_size",
+            )
+        return names
+    
     def handle_file_upload(self, file, field_prefix: str, instance, file_type: str = 'all', max_size_key: str = 'document'):
         """
         Handle file upload and update model instance
@@ -286,18 +415,19 @@ class FileUploadMixin:
         
         file_data = FileStorageHandler.store_file(file, file_type, max_size_key)
         
-        # Update instance fields
-        setattr(instance, f"{field_prefix}_data", file_data['data'])
-        setattr(instance, f"{field_prefix}_name", file_data['name'])
-        setattr(instance, f"{field_prefix}_content_type", file_data['content_type'])
-        setattr(instance, f"{field_prefix}_size", file_data['size'])
+        # Update instance fields. They are plain concrete columns, so writing the
+        # instance __dict__ in one go is equivalent to four setattr() calls
+        data_field, name_field, content_type_field, size_field = self.get_file_field_names(field_prefix)
+        instance.__dict__.update({
+            data_field: file_data['data'],
+            name_field: file_data['name'],
+            content_type_field: file_data['content_type'],
+            size_field: file_data['size'],
+        })
     
     def clear_file_fields(self, instance, field_prefix: str):
         """Clear file fields from model instance"""
-        setattr(instance, f"{field_prefix}_data", None)
-        setattr(instance, f"{field_prefix}_name", None)
-        setattr(instance, f"{field_prefix}_content_type", None)
-        setattr(instance, f"{field_prefix}_size", None)
+        instance.__dict__.update(dict.fromkeys(self.get_file_field_names(field_prefix)))
 
 
 def process_uploaded_file(file, file_type='all', max_size_key='document'):
@@ -315,11 +445,5 @@ def process_uploaded_file(file, file_type='all', max_size_key='document'):
     Raises:
         ValidationError: If file is invalid
     """
-    if not file:
-        raise ValidationError("No file provided")
-    
-    # Validate file
-    file_info = FileValidator.validate_file(file, file_type, max_size_key)
-    
-    # Store file
+    # store_file validates the file itself, so it is read and checked only once
     return FileStorageHandler.store_file(file, file_type, max_size_key)
@@ -1,24 +1,39 @@
-import uuid
+import functools
 import secrets
 import string
+from time import time_ns
 from datetime import datetime, timedelta, time
 from decimal import Decimal
 from typing import List, Dict, Optional, Tuple
 from django.utils import timezone
 from django.core.paginator import Paginator
-from django.db.models import QuerySet, Q
+from django.db.models import Exists, OuterRef, QuerySet, Q
 from django.conf import settings
 import re
 import hashlib
 
 
-def generate_unique_filename(original_filename: str, prefix: str = '') -> str:
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\-_\.]')
+_AVAILABILITY_ENTRY_RE = re.compile(
+    r'(MON|TUE|WED|THU|FRI|SAT|SUN):(\d{1,2}):(\d{1,2})-(\d{1,2}):(\d{1,2})',
+    re.IGNORECASE
+)
+_DAY_MAPPINGS = {
+    'MON': 'monday', 'TUE': 'tuesday', 'WED': 'wednesday',
+    'THU': 'thursday', 'FRI': 'friday', 'SAT': 'saturday', 'SUN': 'sunday'
+}
+
+
+def generate_unique_filename(original_filename: str, prefix: str = '', safe_prefix: bool = False) -> str:
     """
     Generate a unique filename while preserving the extension
     
     Args:
         original_filename: Original file name
         prefix: Optional prefix for the filename
+        safe_prefix: Set when prefix is a trusted constant so only the
+            user-supplied extension needs sanitizing
     
     Returns:
         str: Unique filename
@@ -31,9 +46,12 @@ def generate_unique_filename(original_filename: str, prefix: str = '') -> str:
         name = original_filename
         ext = ""
     
-    # Generate unique identifier
-    unique_id = str(uuid.uuid4())[:8]
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    # Generate unique identifier (one 6-byte read from the OS RNG, no UUID formatting)
+    unique_id = secrets.token_hex(6)
+    timestamp = time_ns()
+    
+    if safe_prefix:
+        ext = _UNSAFE_FILENAME_CHARS_RE.sub('_', ext)
     
     # Combine parts
     if prefix:
@@ -42,7 +60,8 @@ def generate_unique_filename(original_filename: str, prefix: str = '') -> str:
         filename = f"{timestamp}_{unique_id}{ext}"
     
     # Sanitize filename
-    filename = re.sub(r'[^\w\-_\.]', '_', filename)
+    if not safe_prefix:
+        filename = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
     
     return filename
 
@@ -92,33 +111,54 @@ def calculate_consultation_fee(
     Returns:
         dict: Fee breakdown
     """
-    # Convert duration to hours
-    duration_hours = Decimal(duration_minutes) / Decimal('60')
+    # Carry every amount as an exact integer numerator over one common
+    # denominator, using each input's full Decimal precision, until it is
+    # rounded to cents
+    rate_num, rate_den = _exact_ratio(hourly_rate)
+    discount_num, discount_den = _exact_ratio(discount_percentage)
+    platform_fee_num, platform_fee_den = _exact_ratio(platform_fee_percentage)
     
-    # Calculate base amount
-    base_amount = hourly_rate * duration_hours
+    # Calculate base amount: rate * minutes / 60, over 60 * 100 * 100 and the input denominators
+    scale = rate_den * 60 * discount_den * 100 * platform_fee_den
+    base_amount = rate_num * duration_minutes * 100 * discount_den * 100 * platform_fee_den
     
     # Apply discount
-    discount_amount = base_amount * (discount_percentage / Decimal('100'))
+    discount_amount = base_amount * discount_num // (100 * discount_den)
     amount_after_discount = base_amount - discount_amount
     
     # Calculate platform fee
-    platform_fee = amount_after_discount * (platform_fee_percentage / Decimal('100'))
+    platform_fee = amount_after_discount * platform_fee_num // (100 * platform_fee_den)
     
     # Final amounts
     total_amount = amount_after_discount
     professional_amount = amount_after_discount - platform_fee
     
     return {
-        'base_amount': base_amount.quantize(Decimal('0.01')),
-        'discount_amount': discount_amount.quantize(Decimal('0.01')),
-        'platform_fee': platform_fee.quantize(Decimal('0.01')),
-        'total_amount': total_amount.quantize(Decimal('0.01')),
-        'professional_amount': professional_amount.quantize(Decimal('0.01')),
-        'duration_hours': duration_hours
+        'base_amount': _scaled_to_amount(base_amount, scale),
+        'discount_amount': _scaled_to_amount(discount_amount, scale),
+        'platform_fee': _scaled_to_amount(platform_fee, scale),
+        'total_amount': _scaled_to_amount(total_amount, scale),
+        'professional_amount': _scaled_to_amount(professional_amount, scale),
+        'duration_hours': Decimal(duration_minutes) / Decimal('60')
     }
 
 
+def _exact_ratio(value) -> Tuple[int, int]:
+    """Return a Decimal or int as an exact (numerator, denominator) pair"""
+    if not isinstance(value, (Decimal, int)):
+        # Floats can't represent most amounts exactly, and never could be mixed with Decimal here
+        raise TypeError(f"Expected a Decimal amount, got {type(value).__name__}")
+    return value.as_integer_ratio()
+
+
+def _scaled_to_amount(value: int, scale: int) -> Decimal:
+    """Round value / scale cents half-to-even, matching Decimal.quantize, and return the amount"""
+    cents, remainder = divmod(value, scale)
+    if remainder * 2 > scale or (remainder * 2 == scale and cents % 2):
+        cents += 1
+    return Decimal(cents).scaleb(-2)
+
+
 def get_time_slots(
     start_time: time,
     end_time: time,
@@ -140,40 +180,56 @@ def get_time_slots(
         list: Available time slots
     """
     slots = []
-    excluded_times = excluded_times or []
     
-    # Convert times to datetime for easier calculation
-    today = timezone.now().date()
-    current_datetime = datetime.combine(today, start_time)
-    end_datetime = datetime.combine(today, end_time)
-    
-    slot_delta = timedelta(minutes=slot_duration)
-    buffer_delta = timedelta(minutes=buffer_time)
-    total_slot_time = slot_delta + buffer_delta
+    # Work in seconds since midnight instead of datetime/timedelta objects
+    start_seconds = _time_to_seconds(start_time)
+    end_seconds = _time_to_seconds(end_time)
+    slot_seconds = slot_duration * 60
+    step_seconds = (slot_duration + buffer_time) * 60
+    
+    # Merge overlapping exclusions so a single forward sweep can test every slot
+    excluded = []
+    for exc_start, exc_end in sorted(
+        (_time_to_seconds(exc_start), _time_to_seconds(exc_end))
+        for exc_start, exc_end in excluded_times or []
+    ):
+        if excluded and exc_start < excluded[-1][1]:
+            excluded[-1][1] = max(excluded[-1][1], exc_end)
+        else:
+            excluded.append([exc_start, exc_end])
     
-    while current_datetime + slot_delta <= end_datetime:
-        slot_start = current_datetime.time()
-        slot_end = (current_datetime + slot_delta).time()
+    index = 0
+    for slot_start in range(start_seconds, end_seconds - slot_seconds + 1, step_seconds):
+        slot_end = slot_start + slot_seconds
         
-        # Check if slot overlaps with excluded times
-        slot_available = True
-        for exc_start, exc_end in excluded_times:
-            if not (slot_end <= exc_start or slot_start >= exc_end):
-                slot_available = False
-                break
+        # Exclusions that ended before this slot can't affect any later slot
+        while index < len(excluded) and excluded[index][1] <= slot_start:
+            index += 1
         
-        if slot_available:
-            slots.append({
-                'start_time': slot_start,
-                'end_time': slot_end,
-                'duration_minutes': slot_duration
-            })
+        # Check if slot overlaps with excluded times
+        if index < len(excluded) and excluded[index][0] < slot_end:
+            continue
         
-        current_datetime += total_slot_time
+        slots.append({
+            'start_time': _seconds_to_time(slot_start),
+            'end_time': _seconds_to_time(slot_end),
+            'duration_minutes': slot_duration
+        })
     
     return slots
 
 
+def _time_to_seconds(value: time) -> int:
+    """Convert a time of day to seconds since midnight"""
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _seconds_to_time(seconds: int) -> time:
+    """Convert seconds since midnight back to a time of day"""
+    minutes, second = divmod(seconds, 60)
+    return time(minutes // 60, minutes % 60, second)
+
+
 def parse_availability(availability_string: str) -> Dict[str, List[Tuple[time, time]]]:
     """
     Parse availability string into structured format
@@ -186,39 +242,33 @@ def parse_availability(availability_string: str) -> Dict[str, List[Tuple[time, t
     Returns:
         dict: Parsed availability by day
     """
-    availability = {}
-    
     if not availability_string:
-        return availability
+        return {}
     
-    day_mappings = {
-        'MON': 'monday', 'TUE': 'tuesday', 'WED': 'wednesday',
-        'THU': 'thursday', 'FRI': 'friday', 'SAT': 'saturday', 'SUN': 'sunday'
-    }
+    # Parsed once per distinct string; fresh lists keep the cached value immutable
+    return {day_name: list(ranges) for day_name, ranges in _parse_availability(availability_string)}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_availability(availability_string: str) -> Tuple[Tuple[str, Tuple[Tuple[time, time], ...]], ...]:
+    """Parse an availability string into ((day, ((start, end), ...)), ...)"""
+    availability = {}
     
     for day_schedule in availability_string.split(','):
-        if ':' not in day_schedule:
-            continue
-        
-        day_code, time_range = day_schedule.split(':', 1)
-        day_name = day_mappings.get(day_code.upper())
-        
-        if not day_name or '-' not in time_range:
+        match = _AVAILABILITY_ENTRY_RE.fullmatch(day_schedule)
+        if not match:
             continue
         
+        day_code, start_hour, start_minute, end_hour, end_minute = match.groups()
         try:
-            start_str, end_str = time_range.split('-')
-            start_time = datetime.strptime(start_str, '%H:%M').time()
-            end_time = datetime.strptime(end_str, '%H:%M').time()
-            
-            if day_name not in availability:
-                availability[day_name] = []
-            
-            availability[day_name].append((start_time, end_time))
+            start_time = time(int(start_hour), int(start_minute))
+            end_time = time(int(end_hour), int(end_minute))
         except ValueError:
             continue
+        
+        availability.setdefault(_DAY_MAPPINGS[day_code.upper()], []).append((start_time, end_time))
     
-    return availability
+    return tuple((day_name, tuple(ranges)) for day_name, ranges in availability.items())
 
 
 def generate_meeting_id(length: int = 10) -> str:
@@ -250,10 +300,10 @@ def sanitize_input(input_string: str, max_length: int = None) -> str:
         return ""
     
     # Remove HTML tags
-    sanitized = re.sub(r'<[^>]+>', '', input_string)
+    sanitized = _HTML_TAG_RE.sub('', input_string)
     
-    # Remove extra whitespace
-    sanitized = re.sub(r'\s+', ' ', sanitized).strip()
+    # Remove extra whitespace (str.split() breaks on the same characters as \s)
+    sanitized = ' '.join(sanitized.split())
     
     # Truncate if necessary
     if max_length and len(sanitized) > max_length:
@@ -266,7 +316,8 @@ def paginate_queryset(
     queryset: QuerySet,
     page: int = 1,
     per_page: int = 20,
-    max_per_page: int = 100
+    max_per_page: int = 100,
+    with_count: bool = True
 ) -> Dict:
     """
     Paginate a Django queryset
@@ -276,6 +327,8 @@ def paginate_queryset(
         page: Page number
         per_page: Items per page
         max_per_page: Maximum items per page allowed
+        with_count: Whether to run COUNT(*) for total_count/total_pages.
+            When False both are None and has_next comes from fetching one extra row.
     
     Returns:
         dict: Pagination result
@@ -283,6 +336,28 @@ def paginate_queryset(
     # Limit per_page to maximum allowed
     per_page = min(per_page, max_per_page)
     
+    if not with_count:
+        # Fetch one row past the page to learn whether a next page exists
+        page = page if isinstance(page, int) and page > 0 else 1
+        offset = (page - 1) * per_page
+        rows = list(queryset[offset:offset + per_page + 1])
+        has_next = len(rows) > per_page
+        has_previous = page > 1
+        
+        return {
+            'objects': rows[:per_page],
+            'page_info': {
+                'current_page': page,
+                'total_pages': None,
+                'per_page': per_page,
+                'total_count': None,
+                'has_next': has_next,
+                'has_previous': has_previous,
+                'next_page': page + 1 if has_next else None,
+                'previous_page': page - 1 if has_previous else None,
+            }
+        }
+    
     paginator = Paginator(queryset, per_page)
     
     try:
@@ -327,22 +402,26 @@ def search_professionals(
     Returns:
         QuerySet: Filtered professionals
     """
-    from core.models import ProfessionalProfile
+    from core.models import ProfessionalProfile, ConsultationAvailability, ProfessionalPricing
     
     queryset = ProfessionalProfile.objects.filter(
         verification_status='VERIFIED',
         onboarding_completed=True
     )
     
+    # Related-row filters use EXISTS semi-joins, so rows never fan out and need no DISTINCT
     if is_available:
-        queryset = queryset.filter(is_available=True)
+        queryset = queryset.filter(
+            Exists(ConsultationAvailability.objects.filter(professional=OuterRef('pk')))
+        )
     
     if query:
+        # Each icontains is served by a pg_trgm index on PostgreSQL (migration 0013)
         queryset = queryset.filter(
             Q(user__first_name__icontains=query) |
             Q(user__last_name__icontains=query) |
             Q(bio_introduction__icontains=query) |
-            Q(specialization__icontains=query)
+            Q(area_of_expertise__icontains=query)
         )
     
     if location:
@@ -352,12 +431,14 @@ def search_professionals(
         queryset = queryset.filter(area_of_expertise=expertise_area)
     
     if min_rating:
-        queryset = queryset.filter(average_rating__gte=min_rating)
+        queryset = queryset.filter(review_summary__average_rating__gte=min_rating)
     
     if max_rate:
-        queryset = queryset.filter(availability__hourly_rate__lte=max_rate)
+        queryset = queryset.filter(
+            Exists(ProfessionalPricing.objects.filter(professional=OuterRef('pk'), fee_60_min__lte=max_rate))
+        )
     
-    return queryset.distinct()
+    return queryset
 
 
 def filter_by_availability(
@@ -396,29 +477,36 @@ def filter_by_availability(
     end_time = (datetime.combine(date, start_time) + 
                 timedelta(minutes=duration_minutes)).time()
     
-    # Filter by availability
+    # Filter by availability with a semi-join, so a professional with several
+    # matching availability rows is returned once and the scan stops at the first
+    from core.models import ConsultationAvailability
+    
     available_professionals = professionals_queryset.filter(
-        **{f'availability__{day_field}': True},
-        availability__start_time__lte=start_time,
-        availability__end_time__gte=end_time,
-        availability__is_active=True
+        Exists(ConsultationAvailability.objects.filter(
+            professional=OuterRef('pk'),
+            from_time__lte=start_time,
+            to_time__gte=end_time,
+            **{day_field: True}
+        ))
     )
     
     return available_professionals
 
 
-def generate_hash(text: str, algorithm: str = 'sha256') -> str:
+def generate_hash(text: str, algorithm: str = 'blake2b') -> str:
     """
     Generate hash for a given text
     
     Args:
         text: Text to hash
-        algorithm: Hashing algorithm (md5, sha1, sha256)
+        algorithm: Hashing algorithm (blake2b, md5, sha1, sha256)
     
     Returns:
         str: Hash string
     """
-    if algorithm == 'md5':
+    if algorithm == 'blake2b':
+        return hashlib.blake2b(text.encode()).hexdigest()
+    elif algorithm == 'md5':
         return hashlib.md5(text.encode()).hexdigest()
     elif algorithm == 'sha1':
         return hashlib.sha1(text.encode()).hexdigest()
@@ -432,25 +520,29 @@ def mask_sensitive_data(data: str, mask_char: str = '*', visible_chars: int = 4)
     
     Args:
         data: Data to mask
-        mask_char: Character to use for masking
+        mask_char: Character (or string) repeated over the masked part
         visible_chars: Number of characters to keep visible at the end
     
     Returns:
         str: Masked data
     """
-    if not data or len(data) <= visible_chars:
+    length = len(data) if data else 0
+    if length <= visible_chars:
         return data
     
-    masked_part = mask_char * (len(data) - visible_chars)
-    visible_part = data[-visible_chars:]
+    tail = data[length - visible_chars:]
+    if len(mask_char) != 1:
+        # rjust only takes a single fill character
+        return mask_char * (length - visible_chars) + tail
     
-    return masked_part + visible_part
+    # rjust pads the visible tail in one allocation of the final length
+    return tail.rjust(length, mask_char)
 
-import hashlib
 
 def generate_slot_id(professional_id, start_time, end_time):
     """
     Generate a stable unique slot ID using professional + start + end.
     """
     raw = f"{professional_id}-{start_time.isoformat()}-{end_time.isoformat()}"
-    return hashlib.md5(raw.encode()).hexdigest()
+    # 16-byte digest keeps the 32 hex chars clients already expect from slot IDs
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
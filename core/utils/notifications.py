@@ -1,6 +1,16 @@
+import functools
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import Dict, List, Optional
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.exceptions import ValidationError
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
 from django.conf import settings
 from django.utils import timezone
 from core.models import (
@@ -9,11 +19,73 @@ from core.models import (
     # Notification,  # Commented out until implemented
     ProfessionalProfile
 )
+from core import models as core_models
 import logging
-from celery import shared_task 
+from celery import group, shared_task 
+from celery.signals import worker_process_init
 
 logger = logging.getLogger(__name__)
 
+# Links and addresses used in every email, resolved once at import
+_FRONTEND_URL = settings.FRONTEND_URL.rstrip('/')
+_LOGIN_URL = f"{_FRONTEND_URL}/login"
+_DASHBOARD_URL = f"{_FRONTEND_URL}/dashboard"
+_PROFESSIONAL_DASHBOARD_URL = f"{_FRONTEND_URL}/professional/dashboard"
+_SUPPORT_EMAIL = settings.SUPPORT_EMAIL
+
+# (subject, template) of the welcome email, keyed by user.is_professional
+_WELCOME_EMAILS = {
+    True: ("Welcome to LinkDia - Start Your Professional Journey", 'emails/welcome_professional.html'),
+    False: ("Welcome to LinkDia - Find Legal Experts", 'emails/welcome_client.html'),
+}
+
+# Sends only record notifications once the Notification model exists
+_NOTIFICATION_MODEL_ENABLED = hasattr(core_models, 'Notification')
+
+# Stop a bulk send early once this many failures make it clear the SMTP server is refusing us
+BULK_ABORT_MIN_BATCH = 30
+BULK_ABORT_FAILURE_RATIO = 1 / 3
+
+# Recipients handled by each send_email_chunk task when fanning out a bulk send
+BULK_CHUNK_SIZE = 50
+
+# Notifications handled by each process_notification_batch task
+NOTIFICATION_BATCH_SIZE = 100
+
+# Concurrent SMTP sessions per bulk send, each recycled after a fixed number of messages
+BULK_SEND_CONNECTIONS = 5
+BULK_MESSAGES_PER_CONNECTION = 100
+
+# Templates every worker is expected to render, compiled once at worker startup
+EMAIL_TEMPLATES = (
+    'emails/welcome_professional.html',
+    'emails/welcome_client.html',
+    'emails/email_verification.html',
+    'emails/kyc_approved.html',
+    'emails/kyc_rejected.html',
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_template(template: str):
+    """Return the compiled template so bulk sends only pay for rendering"""
+    return get_template(template)
+
+
+@worker_process_init.connect
+def _warm_email_templates(**kwargs):
+    for template in EMAIL_TEMPLATES:
+        try:
+            _get_template(template)
+        except TemplateDoesNotExist:
+            logger.warning(f"Email template {template} not found")
+
+
+@file_changed.connect
+def _reset_email_templates(sender, file_path, **kwargs):
+    # Keep the runserver template reloading working for email templates too
+    _get_template.cache_clear()
+
 
 def send_welcome_email(user: CustomUser) -> bool:
     """
@@ -29,16 +101,11 @@ def send_welcome_email(user: CustomUser) -> bool:
         context = {
             'user': user,
             'user_type': user.get_user_type_display(),
-            'login_url': f"{settings.FRONTEND_URL}/login",
-            'dashboard_url': f"{settings.FRONTEND_URL}/dashboard"
+            'login_url': _LOGIN_URL,
+            'dashboard_url': _DASHBOARD_URL
         }
         
-        if user.is_professional:
-            subject = "Welcome to LinkDia - Start Your Professional Journey"
-            template = 'emails/welcome_professional.html'
-        else:
-            subject = "Welcome to LinkDia - Find Legal Experts"
-            template = 'emails/welcome_client.html'
+        subject, template = _WELCOME_EMAILS[bool(user.is_professional)]
         
         return send_email_notification(
             recipient=user,
@@ -67,7 +134,7 @@ def send_verification_email(user: CustomUser, verification_link: str) -> bool:
         context = {
             'user': user,
             'verification_link': verification_link,
-            'support_email': settings.SUPPORT_EMAIL
+            'support_email': _SUPPORT_EMAIL
         }
         
         subject = "Verify Your Email Address - LinkDia"
@@ -101,7 +168,7 @@ def send_kyc_completion_notice(professional: ProfessionalProfile, approved: bool
             'professional': professional,
             'user': professional.user,
             'approved': approved,
-            'dashboard_url': f"{settings.FRONTEND_URL}/professional/dashboard"
+            'dashboard_url': _PROFESSIONAL_DASHBOARD_URL
         }
         
         if approved:
@@ -128,7 +195,8 @@ def send_email_notification(
     subject: str,
     template: str,
     context: Dict,
-    from_email: Optional[str] = None
+    from_email: Optional[str] = None,
+    connection=None
 ) -> bool:
     """
     Send email notification using template
@@ -139,6 +207,7 @@ def send_email_notification(
         template: Template path
         context: Template context
         from_email: From email address
+        connection: Open mail backend to reuse (optional, a new one is opened per send otherwise)
     
     Returns:
         bool: True if email was sent successfully
@@ -148,26 +217,29 @@ def send_email_notification(
             from_email = settings.DEFAULT_FROM_EMAIL
         
         # Render HTML content
-        html_content = render_to_string(template, context)
+        html_content = _get_template(template).render(context)
         
         # Create and send email
-        email = EmailMultiAlternatives(
+        # Single-part text/html: the empty plain text part only cost a multipart MIME tree
+        email = EmailMessage(
             subject=subject,
-            body='',  # Plain text fallback
+            body=html_content,
             from_email=from_email,
-            to=[recipient.email]
+            to=[recipient.email],
+            connection=connection
         )
-        email.attach_alternative(html_content, "text/html")
+        email.content_subtype = 'html'
         email.send()
         
         # Log notification in database
-        create_notification_record(
-            recipient=recipient,
-            subject=subject,
-            content=html_content,
-            channel='EMAIL',
-            status='SENT'
-        )
+        if _NOTIFICATION_MODEL_ENABLED:
+            create_notification_record(
+                recipient=recipient,
+                subject=subject,
+                content=html_content,
+                channel='EMAIL',
+                status='SENT'
+            )
         
         return True
         
@@ -175,13 +247,14 @@ def send_email_notification(
         logger.error(f"Failed to send email to {recipient.email}: {str(e)}")
         
         # Log failed notification
-        create_notification_record(
-            recipient=recipient,
-            subject=subject,
-            content=f"Failed to send: {str(e)}",
-            channel='EMAIL',
-            status='FAILED'
-        )
+        if _NOTIFICATION_MODEL_ENABLED:
+            create_notification_record(
+                recipient=recipient,
+                subject=subject,
+                content=f"Failed to send: {str(e)}",
+                channel='EMAIL',
+                status='FAILED'
+            )
         
         return False
 
@@ -208,7 +281,10 @@ def create_notification_record(
     Returns:
         None: Placeholder until Notification model is implemented
     """
-    # TODO: Implement when Notification model is created
+    # TODO: Implement when Notification model is created. Store a hash of
+    # sent HTML rather than the full body, e.g.
+    # hashlib.sha256(content.encode(), usedforsecurity=False).hexdigest(),
+    # to keep rows small on bulk sends
     # try:
     #     notification = Notification.objects.create(
     #         recipient=recipient,
@@ -256,13 +332,13 @@ def queue_notification(
         # If using Celery, queue the task
         if schedule_at:
             # Schedule for specific time
-            process_notification.apply_async(
+            process_notification_queue.apply_async(
                 args=[recipient_id, notification_type, context],
                 eta=schedule_at
             )
         else:
             # Process immediately (asynchronously)
-            process_notification.delay(recipient_id, notification_type, context)
+            process_notification_queue.delay(recipient_id, notification_type, context)
         
         return True
         
@@ -271,6 +347,63 @@ def queue_notification(
         return False
 
 
+def queue_notifications(items: List[List], chunk_size: int = NOTIFICATION_BATCH_SIZE) -> bool:
+    """
+    Queue many notifications at once, batched so each task loads its users together
+    
+    Args:
+        items: [recipient_id, notification_type, context] entries
+        chunk_size: Notifications per task
+    
+    Returns:
+        bool: True if the batches were queued successfully
+    """
+    try:
+        items = iter(items)
+        chunks = iter(lambda: list(islice(items, chunk_size)), [])
+        group(process_notification_batch.s(chunk) for chunk in chunks).apply_async()
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to queue notifications: {str(e)}")
+        return False
+
+
+# Handlers for queued notification types, each called with (recipient, context)
+
+def _handle_welcome_email(recipient: CustomUser, context: Dict):
+    return send_welcome_email(recipient)
+
+
+def _handle_email_verification(recipient: CustomUser, context: Dict):
+    return send_verification_email(recipient, context['verification_link'])
+
+
+def _handle_kyc_completion(recipient: CustomUser, context: Dict):
+    return send_kyc_completion_notice(
+        context['professional'], 
+        context['approved']
+    )
+
+
+# Booking notifications are not registered until their send functions exist,
+# so they reach the unknown-type warning instead of failing on a missing name
+_NOTIFICATION_HANDLERS = {
+    'WELCOME_EMAIL': _handle_welcome_email,
+    'EMAIL_VERIFICATION': _handle_email_verification,
+    'KYC_COMPLETION': _handle_kyc_completion,
+}
+
+
+def _dispatch_notification(recipient: CustomUser, notification_type: str, context: Dict) -> None:
+    """Run the handler registered for a notification type"""
+    handler = _NOTIFICATION_HANDLERS.get(notification_type)
+    if handler:
+        handler(recipient, context)
+    else:
+        logger.warning(f"Unknown notification type: {notification_type}")
+
+
 @shared_task
 def process_notification_queue(recipient_id: str, notification_type: str, context: Dict):
     """
@@ -283,28 +416,7 @@ def process_notification_queue(recipient_id: str, notification_type: str, contex
     """
     try:
         recipient = CustomUser.objects.get(id=recipient_id)
-        
-        notification_handlers = {
-            'BOOKING_CONFIRMATION': lambda: send_booking_confirmation(context['booking']),
-            'BOOKING_REMINDER': lambda: send_booking_reminder(context['booking'], context.get('hours_before', 24)),
-            'BOOKING_CANCELLATION': lambda: send_cancellation_notice(
-                context['booking'], 
-                context['cancelled_by'], 
-                context.get('reason', '')
-            ),
-            'WELCOME_EMAIL': lambda: send_welcome_email(recipient),
-            'EMAIL_VERIFICATION': lambda: send_verification_email(recipient, context['verification_link']),
-            'KYC_COMPLETION': lambda: send_kyc_completion_notice(
-                context['professional'], 
-                context['approved']
-            )
-        }
-        
-        handler = notification_handlers.get(notification_type)
-        if handler:
-            handler()
-        else:
-            logger.warning(f"Unknown notification type: {notification_type}")
+        _dispatch_notification(recipient, notification_type, context)
             
     except CustomUser.DoesNotExist:
         logger.error(f"Recipient user {recipient_id} not found")
@@ -312,30 +424,198 @@ def process_notification_queue(recipient_id: str, notification_type: str, contex
         logger.error(f"Failed to process notification: {str(e)}")
 
 
+@shared_task
+def process_notification_batch(items: List[List]):
+    """
+    Celery task to process many queued notifications with a single user query
+    
+    Args:
+        items: [recipient_id, notification_type, context] entries
+    """
+    # Normalize the queued IDs so one malformed ID cannot fail the whole batch
+    pk_field = CustomUser._meta.pk
+    keys = []
+    for recipient_id, _, _ in items:
+        try:
+            keys.append(pk_field.to_python(recipient_id))
+        except ValidationError:
+            keys.append(None)
+    
+    recipients = CustomUser.objects.select_related(
+        'professional_profile', 'client_profile'
+    ).in_bulk({key for key in keys if key is not None})
+    
+    for key, (recipient_id, notification_type, context) in zip(keys, items):
+        recipient = recipients.get(key)
+        if recipient is None:
+            logger.error(f"Recipient user {recipient_id} not found")
+            continue
+        
+        try:
+            _dispatch_notification(recipient, notification_type, context)
+        except Exception as e:
+            logger.error(f"Failed to process notification: {str(e)}")
+
+
 def send_bulk_notifications(
     recipients: List[CustomUser],
     subject: str,
     template: str,
-    context: Dict
+    context: Dict,
+    max_connections: int = BULK_SEND_CONNECTIONS
 ) -> Dict[str, int]:
     """
-    Send notifications to multiple recipients
+    Send notifications to multiple recipients over a small pool of mail connections
+    
+    SMTP round trips are spread across up to max_connections threads, each
+    holding its own connection; with a single connection the batch is sent
+    serially on the calling thread. Large batches are aborted once more than
+    a third of the recipients have failed; the recipients that were never
+    attempted are counted as skipped.
     
     Args:
         recipients: List of recipient users
         subject: Email subject
         template: Template path
         context: Template context
+        max_connections: Most SMTP sessions to hold open at once
     
     Returns:
-        dict: Results with counts of successful/failed sends
+        dict: Results with counts of successful/failed/skipped sends
     """
-    results = {'successful': 0, 'failed': 0}
+    total = len(recipients)
+    if not total:
+        return {'successful': 0, 'failed': 0, 'skipped': 0}
+    
+    max_failures = total * BULK_ABORT_FAILURE_RATIO if total >= BULK_ABORT_MIN_BATCH else None
+    workers = max(1, min(max_connections, total))
+    
+    # Each slot is [connection, messages sent on it]; a worker holds one slot per send
+    slots = []
+    pool = queue.Queue()
     
-    for recipient in recipients:
-        if send_email_notification(recipient, subject, template, context):
-            results['successful'] += 1
+    failures = Counter()
+    failures_lock = threading.Lock()
+    aborted = threading.Event()
+    
+    def send(recipient):
+        if aborted.is_set():
+            return 'skipped'
+        
+        slot = pool.get()
+        try:
+            if slot[1] >= BULK_MESSAGES_PER_CONNECTION:
+                # Start a fresh session; servers often cap messages per session
+                slot[0].close()
+                slot[1] = 0
+                try:
+                    slot[0].open()
+                except Exception as e:
+                    # The send below then reports the failure for this recipient
+                    logger.error(f"Failed to reopen mail connection: {str(e)}")
+            sent = send_email_notification(recipient, subject, template, context, connection=slot[0])
+            slot[1] += 1
+        finally:
+            pool.put(slot)
+        
+        if sent:
+            return 'successful'
+        
+        with failures_lock:
+            failures['failed'] += 1
+            if max_failures is not None and failures['failed'] > max_failures and not aborted.is_set():
+                aborted.set()
+                logger.error(
+                    f"Aborting bulk send '{subject}' after {failures['failed']} of {total} failures"
+                )
+        return 'failed'
+    
+    def send_threaded(recipient):
+        try:
+            return send(recipient)
+        finally:
+            # Worker threads get their own DB connection if rendering queried anything
+            db_connection.close()
+    
+    try:
+        # Open every session up front: a closed backend would connect, send
+        # and disconnect again for each message
+        try:
+            for _ in range(workers):
+                connection = get_connection()
+                connection.open()
+                slots.append([connection, 0])
+                pool.put(slots[-1])
+        except Exception as e:
+            # Nothing can be delivered without a mail server; report the batch as failed
+            logger.error(f"Failed to open mail connection for bulk send '{subject}': {str(e)}")
+            return {'successful': 0, 'failed': total, 'skipped': 0}
+        
+        if workers == 1:
+            results = Counter(map(send, recipients))
         else:
-            results['failed'] += 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = Counter(executor.map(send_threaded, recipients))
+    finally:
+        for connection, _ in slots:
+            connection.close()
     
-    return results
+    return {
+        'successful': results['successful'],
+        'failed': results['failed'],
+        'skipped': results['skipped'],
+    }
+
+
+@shared_task
+def send_email_chunk(recipient_ids: List[str], subject: str, template: str, context: Dict) -> Dict[str, int]:
+    """
+    Celery task sending one chunk of a bulk notification over a single connection
+    
+    Chunks are sent serially: the email_bulk worker already runs many chunk
+    tasks at once, so each task holds only one SMTP session.
+    
+    Args:
+        recipient_ids: IDs of the recipient users in this chunk
+        subject: Email subject
+        template: Template path
+        context: Template context
+    
+    Returns:
+        dict: Results with counts of successful/failed/skipped sends
+    """
+    recipients = list(CustomUser.objects.filter(id__in=recipient_ids))
+    return send_bulk_notifications(recipients, subject, template, context, max_connections=1)
+
+
+def queue_bulk_notifications(
+    recipients: List[CustomUser],
+    subject: str,
+    template: str,
+    context: Dict,
+    chunk_size: int = BULK_CHUNK_SIZE
+) -> bool:
+    """
+    Fan a bulk notification out to the email workers in chunks (use with Celery)
+    
+    Args:
+        recipients: List of recipient users
+        subject: Email subject
+        template: Template path
+        context: Template context (must be serializable by the Celery broker)
+        chunk_size: Recipients per task
+    
+    Returns:
+        bool: True if the chunks were queued successfully
+    """
+    try:
+        recipient_ids = iter([str(recipient.id) for recipient in recipients])
+        chunks = iter(lambda: list(islice(recipient_ids, chunk_size)), [])
+        group(
+            send_email_chunk.s(chunk, subject, template, context) for chunk in chunks
+        ).apply_async()
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to queue bulk notification '{subject}': {str(e)}")
+        return False
@@ -1,5 +1,4 @@
 from typing import Optional
-from django.contrib.auth.models import AnonymousUser
 from graphql import GraphQLError
 from core.models import (
     CustomUser,
@@ -9,7 +8,7 @@ from core.models import (
     VideoKYC,
     Portfolio,
 )
-from core.utils.decorators import require_professional
+from core.utils.decorators import get_verification_status, require_professional
 
 # Alias for better naming
 professional_required = require_professional
@@ -17,15 +16,30 @@ professional_required = require_professional
 # Another alias for GraphQL mutations  
 require_professional_user = require_professional
 
+_MISSING = object()
+
+
+def _verified_professional(user: CustomUser) -> bool:
+    """
+    Check whether the user is a verified professional, once per user instance
+    
+    The answer is stored on the user object, which lives for a single request,
+    so repeated permission checks while resolving a query cost one lookup.
+    """
+    verified = getattr(user, '_verified_professional_cached', _MISSING)
+    if verified is _MISSING:
+        verified = user.is_professional and get_verification_status(user) == 'VERIFIED'
+        user._verified_professional_cached = verified
+    return verified
+
 
 def login_required(func):
     """
     Decorator to require user authentication for GraphQL resolvers
     """
     def wrapper(self, info, *args, **kwargs):
-        user = info.context.user
-        
-        if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+        # The middleware always sets a user, falling back to AnonymousUser
+        if not info.context.user.is_authenticated:
             raise GraphQLError("Authentication required")
         
         return func(self, info, *args, **kwargs)
@@ -43,7 +57,7 @@ def can_view_profile(user: CustomUser, target_profile: ProfessionalProfile) -> b
     Returns:
         bool: True if user can view the profile
     """
-    if not user or isinstance(user, AnonymousUser):
+    if user is None or not user.is_authenticated:
         # Anonymous users can only view verified profiles
         return target_profile.verification_status == 'VERIFIED'
     
@@ -52,9 +66,7 @@ def can_view_profile(user: CustomUser, target_profile: ProfessionalProfile) -> b
         return True
     
     # Verified professionals can view each other's profiles
-    if (user.is_professional and
-        hasattr(user, 'professional_profile') and
-        user.professional_profile.verification_status == 'VERIFIED'):
+    if _verified_professional(user):
         return True
     
     # Clients can view verified professional profiles
@@ -75,7 +87,7 @@ def can_edit_profile(user: CustomUser, target_profile: ProfessionalProfile) -> b
     Returns:
         bool: True if user can edit the profile
     """
-    if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+    if user is None or not user.is_authenticated:
         return False
     
     # Users can only edit their own profile
@@ -93,7 +105,7 @@ def can_view_documents(user: CustomUser, document: ProfessionalDocument) -> bool
     Returns:
         bool: True if user can view the document
     """
-    if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+    if user is None or not user.is_authenticated:
         return False
     
     # Document owner can always view
@@ -119,7 +131,7 @@ def can_verify_kyc(user: CustomUser, kyc_session: VideoKYC) -> bool:
     Returns:
         bool: True if user can verify
     """
-    if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+    if user is None or not user.is_authenticated:
         return False
     
     # Only admin/staff users can verify KYC
@@ -142,18 +154,14 @@ def is_profile_owner(user: CustomUser, profile_id: str, profile_type: str = 'pro
     Returns:
         bool: True if user owns the profile
     """
-    if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+    if user is None or not user.is_authenticated:
         return False
     
-    try:
-        if profile_type == 'professional':
-            profile = ProfessionalProfile.objects.get(id=profile_id)
-            return user == profile.user
-        elif profile_type == 'client':
-            profile = ClientProfile.objects.get(id=profile_id)
-            return user == profile.user
-    except (ProfessionalProfile.DoesNotExist, ClientProfile.DoesNotExist):
-        return False
+    # A single SELECT 1 ... LIMIT 1 instead of loading the profile and its user
+    if profile_type == 'professional':
+        return ProfessionalProfile.objects.filter(id=profile_id, user=user).exists()
+    elif profile_type == 'client':
+        return ClientProfile.objects.filter(id=profile_id, user=user).exists()
     
     return False
 
@@ -169,7 +177,7 @@ def can_manage_availability(user: CustomUser, professional_profile: Professional
     Returns:
         bool: True if user can manage availability
     """
-    if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+    if user is None or not user.is_authenticated:
         return False
     
     # Only the profile owner can manage their availability
@@ -188,7 +196,7 @@ def can_access_portfolio(user: CustomUser, portfolio: Portfolio) -> bool:
         bool: True if user can access portfolio
     """
     # Portfolios are publicly viewable for now (simplified)
-    if not user or isinstance(user, AnonymousUser):
+    if user is None or not user.is_authenticated:
         return True
     
     # Portfolio owner can always access
@@ -206,6 +214,9 @@ def require_permission(permission_func, *permission_args, error_message: str = "
     """
     Decorator to require specific permissions for GraphQL resolvers
     
+    Results are memoized in the request's permission_cache, so a check shared
+    by several resolvers runs once per request.
+    
     Args:
         permission_func: Permission check function
         *permission_args: Arguments to pass to permission function (excluding user)
@@ -214,9 +225,22 @@ def require_permission(permission_func, *permission_args, error_message: str = "
     def decorator(func):
         def wrapper(self, info, *args, **kwargs):
             user = info.context.user
+            permission_cache = getattr(info.context, 'permission_cache', None)
+            key = (permission_func, permission_args)
+            
+            try:
+                allowed = permission_cache[key]
+            except (KeyError, TypeError):
+                # Call permission function with user as first argument
+                allowed = permission_func(user, *permission_args)
+                if permission_cache is not None:
+                    try:
+                        permission_cache[key] = allowed
+                    except TypeError:
+                        # Unhashable permission arguments are simply not cached
+                        pass
             
-            # Call permission function with user as first argument
-            if not permission_func(user, *permission_args):
+            if not allowed:
                 raise GraphQLError(error_message)
             
             return func(self, info, *args, **kwargs)
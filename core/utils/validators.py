@@ -1,3 +1,4 @@
+import functools
 import re
 import phonenumbers
 from django.core.exceptions import ValidationError
@@ -5,7 +6,56 @@ from django.core.validators import validate_email
 from django.utils import timezone
 from datetime import datetime, timedelta
 from typing import List, Optional
-import magic
+from core.utils.file_handlers import sniff_content_type
+
+
+# Character classes required in a strong password, as bit flags
+_UPPER, _LOWER, _DIGIT, _SPECIAL = 1, 2, 4, 8
+_PASSWORD_SPECIAL_CHARS = '!@#$%^&*()_+-=[]{};\':"\\|,.<>?'
+
+
+def _build_char_class_table() -> bytes:
+    table = bytearray(256)
+    for char in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        table[ord(char)] = _UPPER
+    for char in 'abcdefghijklmnopqrstuvwxyz':
+        table[ord(char)] = _LOWER
+    for char in '0123456789':
+        table[ord(char)] = _DIGIT
+    for char in _PASSWORD_SPECIAL_CHARS:
+        table[ord(char)] = _SPECIAL
+    return bytes(table)
+
+
+# Maps every byte to its class flag (0 for bytes outside the four classes)
+_CHAR_CLASS_TABLE = _build_char_class_table()
+
+_PASSWORD_CLASS_FEEDBACK = (
+    (_UPPER, "Password must contain at least one uppercase letter"),
+    (_LOWER, "Password must contain at least one lowercase letter"),
+    (_DIGIT, "Password must contain at least one number"),
+    (_SPECIAL, "Password must contain at least one special character"),
+)
+
+# Patterns used by the validators below, compiled once at import
+# Matched against the lowercased password
+_RE_COMMON_PATTERNS = re.compile(r'12345|password|qwerty|abc123')
+_RE_IFSC = re.compile(r'^[A-Z]{4}0[A-Z0-9]{6}$')
+_RE_ACCOUNT_NUMBER = re.compile(r'^[0-9]{9,18}$')
+
+# Bank account fields that must be present, with their error messages
+_BANK_REQUIRED_FIELDS = {
+    field: f"{field.replace('_', ' ').title()} is required"
+    for field in ('account_holder_name', 'bank_name', 'account_number', 'ifsc_code')
+}
+
+# Basic validation patterns for different license types
+_LICENSE_PATTERNS = {
+    'bar': re.compile(r'^[A-Z]{2}[0-9]{4,8}$'),  # Example: KA123456
+    'medical': re.compile(r'^[0-9]{4,10}$'),
+    'ca': re.compile(r'^[0-9]{6}$')  # Chartered Accountant
+}
+_LICENSE_DEFAULT_PATTERN = re.compile(r'^[A-Z0-9]{4,12}$')
 
 
 def validate_email_format(email: str) -> bool:
@@ -19,36 +69,68 @@ def validate_email_format(email: str) -> bool:
         return False
 
 
+# Keys of the dict returned by validate_phone_number
+_PHONE_RESULT_KEYS = ('is_valid', 'formatted', 'type', 'country')
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_phone_number(phone: str, country_code: str) -> Optional[tuple]:
+    """Parse and validate a number once; None when it cannot be parsed"""
+    try:
+        parsed = phonenumbers.parse(phone, country_code)
+    except phonenumbers.NumberParseException:
+        return None
+    return parsed, phonenumbers.is_valid_number(parsed)
+
+
+@functools.lru_cache(maxsize=4096)
+def _describe_phone_number(phone: str, country_code: str) -> tuple:
+    result = _parse_phone_number(phone, country_code)
+    if result is None:
+        return (False, None, None, None)
+    
+    # The geocoder loads a large dataset, so it is only imported once a country is needed
+    from phonenumbers import geocoder
+    
+    parsed, is_valid = result
+    return (
+        is_valid,
+        phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
+        str(phonenumbers.number_type(parsed)),
+        geocoder.description_for_number(parsed, 'en')
+    )
+
+
 def validate_phone_number(phone: str, country_code: str = 'IN') -> dict:
     """
     Validate phone number format using phonenumbers library
     
+    Results are memoized per (phone, country_code), since the same number is
+    usually validated several times during registration and payment setup.
+    
     Args:
         phone: Phone number string
         country_code: ISO country code (default: 'IN' for India)
     
     Returns:
-        dict: Validation result with is_valid, formatted, and type
+        dict: Validation result with is_valid, formatted, type and country
     """
-    try:
-        parsed = phonenumbers.parse(phone, country_code)
-        is_valid = phonenumbers.is_valid_number(parsed)
-        formatted = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-        number_type = phonenumbers.number_type(parsed)
-        
-        return {
-            'is_valid': is_valid,
-            'formatted': formatted,
-            'type': str(number_type),
-            'country': phonenumbers.geocoder.description_for_number(parsed, 'en')
-        }
-    except phonenumbers.NumberParseException:
-        return {
-            'is_valid': False,
-            'formatted': None,
-            'type': None,
-            'country': None
-        }
+    return dict(zip(_PHONE_RESULT_KEYS, _describe_phone_number(phone, country_code)))
+
+
+def is_valid_phone_number(phone: str, country_code: str = 'IN') -> bool:
+    """
+    Check a phone number without formatting it or looking up its country
+    
+    Args:
+        phone: Phone number string
+        country_code: ISO country code (default: 'IN' for India)
+    
+    Returns:
+        bool: True if the number is valid
+    """
+    result = _parse_phone_number(phone, country_code)
+    return result is not None and result[1]
 
 
 def validate_file_type(file, allowed_types: List[str]) -> bool:
@@ -66,7 +148,8 @@ def validate_file_type(file, allowed_types: List[str]) -> bool:
         file_content = file.read(1024)  # Read first 1KB
         file.seek(0)  # Reset file pointer
         
-        mime_type = magic.from_buffer(file_content, mime=True)
+        # Reuses the per-thread libmagic handle and MIME cache of the upload validator
+        mime_type = sniff_content_type(file_content)
         return mime_type in allowed_types
     except Exception:
         return False
@@ -106,39 +189,25 @@ def validate_password_strength(password: str) -> dict:
     else:
         feedback.append("Password must be at least 8 characters long")
     
-    if re.search(r'[A-Z]', password):
-        score += 1
-    else:
-        feedback.append("Password must contain at least one uppercase letter")
-    
-    if re.search(r'[a-z]', password):
-        score += 1
-    else:
-        feedback.append("Password must contain at least one lowercase letter")
-    
-    if re.search(r'\d', password):
-        score += 1
-    else:
-        feedback.append("Password must contain at least one number")
-    
-    if re.search(r'[!@#$%^&*()_+\-=\[\]{};\':"\\|,.<>\?]', password):
-        score += 1
-    else:
-        feedback.append("Password must contain at least one special character")
+    # Classify every character in one pass; multi-byte UTF-8 sequences map to 0
+    flags = 0
+    for flag in set(password.encode('utf-8', 'surrogatepass').translate(_CHAR_CLASS_TABLE)):
+        flags |= flag
+    if not flags & _DIGIT and not password.isascii():
+        # Non-ASCII decimal digits count as numbers too
+        if any(char.isdecimal() for char in password):
+            flags |= _DIGIT
+    
+    for flag, message in _PASSWORD_CLASS_FEEDBACK:
+        if flags & flag:
+            score += 1
+        else:
+            feedback.append(message)
     
     # Check for common patterns
-    common_patterns = [
-        r'12345',
-        r'password',
-        r'qwerty',
-        r'abc123'
-    ]
-    
-    for pattern in common_patterns:
-        if re.search(pattern, password.lower()):
-            score -= 1
-            feedback.append("Password contains common patterns")
-            break
+    if _RE_COMMON_PATTERNS.search(password.lower()):
+        score -= 1
+        feedback.append("Password contains common patterns")
     
     strength_levels = {
         0: "Very Weak",
@@ -168,69 +237,77 @@ def validate_professional_license(license_number: str, license_type: str = 'bar'
     Returns:
         dict: Validation result
     """
-    # Basic validation patterns for different license types
-    patterns = {
-        'bar': r'^[A-Z]{2}[0-9]{4,8}$',  # Example: KA123456
-        'medical': r'^[0-9]{4,10}$',
-        'ca': r'^[0-9]{6}$'  # Chartered Accountant
-    }
+    pattern = _LICENSE_PATTERNS.get(license_type.lower(), _LICENSE_DEFAULT_PATTERN)
+    upper = license_number.upper()
     
-    pattern = patterns.get(license_type.lower(), r'^[A-Z0-9]{4,12}$')
-    
-    is_valid = bool(re.match(pattern, license_number.upper()))
+    is_valid = pattern.match(upper) is not None
     
     return {
         'is_valid': is_valid,
-        'formatted': license_number.upper() if is_valid else license_number,
+        'formatted': upper if is_valid else license_number,
         'type': license_type
     }
 
 
-def validate_consultation_time(consultation_date: datetime, duration_minutes: int = 60) -> dict:
-    """
-    Validate consultation booking time
-    
-    Args:
-        consultation_date: Proposed consultation datetime
-        duration_minutes: Duration in minutes
-    
-    Returns:
-        dict: Validation result
-    """
-    now = timezone.now()
+# Booking window and business rules for consultations
+_MIN_ADVANCE_BOOKING = timedelta(hours=2)
+_MAX_ADVANCE_BOOKING = timedelta(days=180)  # 6 months
+_BUSINESS_HOURS_START, _BUSINESS_HOURS_END = 9, 21  # 9 AM to 9 PM
+_MIN_DURATION_MINUTES, _MAX_DURATION_MINUTES = 30, 180
+
+
+def _consultation_time_errors(consultation_date: datetime, duration_minutes: int, now: datetime) -> List[str]:
+    """Describe every rule a rejected consultation time breaks"""
     errors = []
     
     # Check if date is in the future
     if consultation_date <= now:
         errors.append("Consultation date must be in the future")
     
-    # Check if date is too far in advance (e.g., 6 months)
-    max_advance = now + timedelta(days=180)
-    if consultation_date > max_advance:
+    # Check if date is too far in advance
+    if consultation_date > now + _MAX_ADVANCE_BOOKING:
         errors.append("Consultation date cannot be more than 6 months in advance")
     
-    # Check minimum advance booking time (e.g., 2 hours)
-    min_advance = now + timedelta(hours=2)
-    if consultation_date < min_advance:
+    # Check minimum advance booking time
+    if consultation_date < now + _MIN_ADVANCE_BOOKING:
         errors.append("Consultation must be booked at least 2 hours in advance")
     
-    # Check business hours (9 AM to 9 PM)
-    consultation_hour = consultation_date.hour
-    if consultation_hour < 9 or consultation_hour > 21:
+    # Check business hours
+    if not _BUSINESS_HOURS_START <= consultation_date.hour <= _BUSINESS_HOURS_END:
         errors.append("Consultations are only available between 9 AM and 9 PM")
     
     # Check duration
-    if duration_minutes < 30 or duration_minutes > 180:
+    if not _MIN_DURATION_MINUTES <= duration_minutes <= _MAX_DURATION_MINUTES:
         errors.append("Consultation duration must be between 30 and 180 minutes")
     
-    # Check if it's a weekend (if needed)
-    if consultation_date.weekday() > 4:  # Saturday = 5, Sunday = 6
-        # This could be configurable per professional
-        pass
+    # Weekends are allowed for now; this could become configurable per professional
+    
+    return errors
+
+
+def validate_consultation_time(consultation_date: datetime, duration_minutes: int = 60) -> dict:
+    """
+    Validate consultation booking time
+    
+    Args:
+        consultation_date: Proposed consultation datetime
+        duration_minutes: Duration in minutes
+    
+    Returns:
+        dict: Validation result
+    """
+    now = timezone.now()
+    
+    # Most requests are valid, so test every rule at once and only build messages on failure
+    is_valid = (
+        now + _MIN_ADVANCE_BOOKING <= consultation_date <= now + _MAX_ADVANCE_BOOKING
+        and _BUSINESS_HOURS_START <= consultation_date.hour <= _BUSINESS_HOURS_END
+        and _MIN_DURATION_MINUTES <= duration_minutes <= _MAX_DURATION_MINUTES
+    )
     
     return {
-        'is_valid': len(errors) == 0,
-        'errors': errors,
+        'is_valid': is_valid,
+        'errors': [] if is_valid else _consultation_time_errors(consultation_date, duration_minutes, now),
         'consultation_date': consultation_date,
         'end_time': consultation_date + timedelta(minutes=duration_minutes)
     }
@@ -250,20 +327,18 @@ def validate_payment_details(payment_type: str, payment_data: dict) -> dict:
     errors = []
     
     if payment_type == 'BANK_ACCOUNT':
-        required_fields = ['account_holder_name', 'bank_name', 'account_number', 'ifsc_code']
-        
-        for field in required_fields:
+        for field, message in _BANK_REQUIRED_FIELDS.items():
             if not payment_data.get(field):
-                errors.append(f"{field.replace('_', ' ').title()} is required")
+                errors.append(message)
         
         # Validate IFSC code format (Indian banks)
         ifsc_code = payment_data.get('ifsc_code', '')
-        if ifsc_code and not re.match(r'^[A-Z]{4}0[A-Z0-9]{6}$', ifsc_code):
+        if ifsc_code and not _RE_IFSC.match(ifsc_code):
             errors.append("Invalid IFSC code format")
         
         # Validate account number
         account_number = payment_data.get('account_number', '')
-        if account_number and not re.match(r'^[0-9]{9,18}$', account_number):
+        if account_number and not _RE_ACCOUNT_NUMBER.match(account_number):
             errors.append("Account number must be 9-18 digits")
     
     elif payment_type == 'DIGITAL_WALLET':
@@ -277,8 +352,7 @@ def validate_payment_details(payment_type: str, payment_data: dict) -> dict:
             if not phone:
                 errors.append("Phone number is required for this wallet")
             else:
-                phone_validation = validate_phone_number(phone)
-                if not phone_validation['is_valid']:
+                if not is_valid_phone_number(phone):
                     errors.append("Invalid phone number format")
         
         elif wallet_provider == 'PAYPAL':
@@ -294,3 +368,53 @@ def validate_payment_details(payment_type: str, payment_data: dict) -> dict:
         'payment_type': payment_type,
         'validated_data': payment_data
     }
+
+
+def validate_payment_details_bulk(records: List[dict]) -> List[dict]:
+    """
+    Validate many payment methods at once, e.g. for an onboarding import
+    
+    Bank accounts are checked column by column: each field is pulled out of
+    every record into its own list and each compiled pattern is mapped over
+    that list, instead of running the whole per-record validator in a loop.
+    Other payment types fall back to validate_payment_details.
+    
+    Args:
+        records: Dictionaries with 'payment_type' and 'payment_data' keys
+    
+    Returns:
+        list: One result per record, in input order, as returned by validate_payment_details
+    """
+    results = [None] * len(records)
+    
+    bank_rows = [i for i, record in enumerate(records) if record['payment_type'] == 'BANK_ACCOUNT']
+    bank_data = [records[i]['payment_data'] for i in bank_rows]
+    
+    missing = {
+        message: [not data.get(field) for data in bank_data]
+        for field, message in _BANK_REQUIRED_FIELDS.items()
+    }
+    ifsc_codes = [data.get('ifsc_code', '') for data in bank_data]
+    ifsc_matches = list(map(_RE_IFSC.match, [code or '' for code in ifsc_codes]))
+    account_numbers = [data.get('account_number', '') for data in bank_data]
+    account_matches = list(map(_RE_ACCOUNT_NUMBER.match, [number or '' for number in account_numbers]))
+    
+    for row, i in enumerate(bank_rows):
+        errors = [message for message, column in missing.items() if column[row]]
+        if ifsc_codes[row] and not ifsc_matches[row]:
+            errors.append("Invalid IFSC code format")
+        if account_numbers[row] and not account_matches[row]:
+            errors.append("Account number must be 9-18 digits")
+        
+        results[i] = {
+            'is_valid': len(errors) == 0,
+            'errors': errors,
+            'payment_type': 'BANK_ACCOUNT',
+            'validated_data': bank_data[row]
+        }
+    
+    for i, record in enumerate(records):
+        if results[i] is None:
+            results[i] = validate_payment_details(record['payment_type'], record['payment_data'])
+    
+    return results
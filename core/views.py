@@ -1,26 +1,75 @@
+import orjson
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, Http404
 from django.shortcuts import redirect
+from django.views.decorators.http import require_GET
+from core.models import CustomUser
+from core.utils.file_handlers import FileStorageHandler
 
 # Create your views here.
 
+
+def encode_json(data) -> bytes:
+    """Serialize data to compact JSON bytes with orjson"""
+    return orjson.dumps(data)
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    HttpResponse that encodes its data with orjson
+    """
+    
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=encode_json(data), **kwargs)
+
+
+# The API info never changes, so it is serialized once at import
+HOME_CONTENT = encode_json({
+    'message': 'Welcome to Linkdia API',
+    'version': '1.0',
+    'endpoints': {
+        'graphql': '/graphql/',
+        'admin': '/admin/',
+        'accounts': '/accounts/'
+    },
+    'graphql_playground': '/graphql/'
+})
+
+
 def home_view(request):
     """
     Simple home view that provides API information
     """
     if request.method == 'GET':
-        return JsonResponse({
-            'message': 'Welcome to Linkdia API',
-            'version': '1.0',
-            'endpoints': {
-                'graphql': '/graphql/',
-                'admin': '/admin/',
-                'accounts': '/accounts/'
-            },
-            'graphql_playground': '/graphql/'
-        })
+        # A fresh response per request so middleware can safely set headers on it
+        return HttpResponse(HOME_CONTENT, content_type='application/json')
     elif request.method == 'POST':
         # Redirect POST requests to GraphQL endpoint
         return redirect('/graphql/')
     else:
-        return JsonResponse({'error': 'Method not allowed'}, status=405)
+        return OrjsonResponse({'error': 'Method not allowed'}, status=405)
+
+
+@require_GET
+def profile_picture_view(request, token):
+    """
+    Stream a profile picture addressed by a signed URL token
+    """
+    user_id = FileStorageHandler.load_profile_picture_token(token)
+    if user_id is None:
+        raise Http404("Profile picture not found")
+
+    user = CustomUser.objects.filter(pk=user_id).only(
+        'profile_picture_data', 'profile_picture_name', 'profile_picture_content_type'
+    ).first()
+    if not user or not user.profile_picture_data:
+        raise Http404("Profile picture not found")
+
+    response = FileStorageHandler.get_file_response(
+        user.profile_picture_data,
+        user.profile_picture_name or 'profile_picture',
+        user.profile_picture_content_type or 'application/octet-stream'
+    )
+    response['Cache-Control'] = f"private, max-age={FileStorageHandler.PROFILE_PICTURE_URL_MAX_AGE}"
+    return response